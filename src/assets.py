@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import os
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from src.config import ConfigManager
+from src.db.database_manager import DatabaseManager
+from src.metrics import MetricsRegistry
+from src.net.http_client import AsyncHttpClient
+
+# Set up logging for the asset pipeline
+logger = logging.getLogger(__name__)
+
+ASSET_DOWNLOADS = MetricsRegistry().counter(
+    "pro_scanner_asset_downloads_total", "Profile pictures by outcome (stored, duplicate, skipped, dropped, error).", ("outcome",)
+)
+ASSET_BYTES = MetricsRegistry().counter(
+    "pro_scanner_asset_bytes_total", "Bytes of profile pictures downloaded."
+)
+
+EXTENSIONS = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp", "image/gif": ".gif", "image/avif": ".avif"}
+
+class AvatarDownloader:
+    """
+    Downloads the profile pictures of FOUND profiles in the background, over the
+    shared connection pool, without holding up the scan. Results hand their picture
+    URL to a bounded queue that a few workers drain; when the queue is full the
+    picture is dropped rather than making the scan wait.
+
+    Bodies are streamed to a temporary file while they are hashed, then moved to
+    `<directory>/<first two hex digits>/<sha256><ext>`. Identical images (default
+    avatars, the same picture on a re-scan) are therefore stored once. Which account
+    uses which file is recorded in the `assets` table.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, directory: str = "avatars", concurrency: int = 4,
+                 queue_size: int = 1000, max_bytes: int = 5 * 1024 * 1024, detail_keys: Tuple[str, ...] = ("profile_pic_url", "avatar_url"),
+                 drain_timeout: float = 30.0):
+        self.db_manager = db_manager
+        self.directory = directory
+        self.concurrency = max(1, concurrency)
+        self.queue_size = queue_size
+        self.max_bytes = max_bytes
+        self.detail_keys = tuple(detail_keys)
+        self.drain_timeout = drain_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        # Recently fetched URLs -> (digest, path), so a URL seen twice in a run is fetched once
+        self._seen: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @classmethod
+    def from_config(cls, db_manager: DatabaseManager, config: Optional[ConfigManager] = None) -> Optional['AvatarDownloader']:
+        """Builds the downloader from the `assets` settings, or returns None when it is disabled."""
+        config = config or ConfigManager()
+        if not config.get_setting("assets.enabled", False):
+            return None
+        return cls(
+            db_manager,
+            directory=config.get_setting("assets.directory", "avatars"),
+            concurrency=config.get_setting("assets.concurrency", 4),
+            queue_size=config.get_setting("assets.queue_size", 1000),
+            max_bytes=config.get_setting("assets.max_bytes", 5 * 1024 * 1024),
+            detail_keys=tuple(config.get_setting("assets.detail_keys", ["profile_pic_url", "avatar_url"])),
+            drain_timeout=config.get_setting("assets.drain_timeout_seconds", 30.0)
+        )
+
+    def submit(self, platform: str, username: str, result: Dict):
+        """Queues the picture of a FOUND result, if it has one. Never waits."""
+        if result.get("status") != "FOUND":
+            return
+        details = result.get("details") or {}
+        url = next((details[key] for key in self.detail_keys if details.get(key)), None)
+        if not url:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._workers = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+        try:
+            self._queue.put_nowait((platform, username, str(url)))
+        except asyncio.QueueFull:
+            ASSET_DOWNLOADS.labels("dropped").inc()
+            logger.debug(f"Avatar queue full; skipping {platform}/{username}")
+
+    async def _work(self):
+        while True:
+            platform, username, url = await self._queue.get()
+            try:
+                await self._download(platform, username, url)
+            except (httpx.HTTPError, OSError) as e:
+                ASSET_DOWNLOADS.labels("error").inc()
+                logger.warning(f"Could not download the avatar of {platform}/{username}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _path_for(self, digest: str, extension: str) -> str:
+        return os.path.join(self.directory, digest[:2], digest + extension)
+
+    async def _download(self, platform: str, username: str, url: str):
+        stored = self._seen.get(url)
+        if stored is None and url in self._inflight:
+            # Another worker is fetching the same picture; reuse its file
+            stored = await asyncio.shield(self._inflight[url])
+            if stored is None:
+                return
+        if stored is not None:
+            ASSET_DOWNLOADS.labels("duplicate").inc()
+            await self.db_manager.save_asset(platform, username, url, stored[0], stored[1], time.time())
+            return
+
+        future = self._inflight[url] = asyncio.get_running_loop().create_future()
+        try:
+            stored = await self._fetch(url)
+            future.set_result(stored)
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Waiters re-raise it; don't warn when there are none
+            raise
+        finally:
+            del self._inflight[url]
+        if stored is None:
+            return
+        self._seen[url] = stored
+        if len(self._seen) > self.queue_size:
+            self._seen.popitem(last=False)
+        await self.db_manager.save_asset(platform, username, url, stored[0], stored[1], time.time())
+
+    async def _fetch(self, url: str) -> Optional[Tuple[str, str]]:
+        """Streams one picture to disk and returns its (digest, path), or None if it was skipped."""
+        client = await AsyncHttpClient.get_instance()
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = os.path.join(self.directory, f".{os.getpid()}-{id(asyncio.current_task())}.part")
+        sha256 = hashlib.sha256()
+        size = 0
+        try:
+            async with client.stream("GET", url) as response:
+                content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+                if response.status_code != 200 or not content_type.startswith("image/"):
+                    ASSET_DOWNLOADS.labels("skipped").inc()
+                    logger.debug(f"Not an image ({response.status_code}, {content_type}) at {url}")
+                    return None
+                with open(tmp_path, "wb") as f:
+                    async for chunk in response.aiter_bytes():
+                        size += len(chunk)
+                        if size > self.max_bytes:
+                            ASSET_DOWNLOADS.labels("skipped").inc()
+                            logger.debug(f"Avatar larger than {self.max_bytes} bytes at {url}")
+                            return None
+                        sha256.update(chunk)
+                        f.write(chunk)
+            digest = sha256.hexdigest()
+            path = self._path_for(digest, EXTENSIONS.get(content_type, ".img"))
+            if os.path.exists(path):
+                ASSET_DOWNLOADS.labels("duplicate").inc()
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+                ASSET_DOWNLOADS.labels("stored").inc()
+            ASSET_BYTES.inc(size)
+            return digest, path
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    async def close(self):
+        """Lets queued downloads finish for up to `drain_timeout` seconds, then stops."""
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Stopped with {self._queue.qsize()} avatar download(s) still queued.")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        self._queue = None
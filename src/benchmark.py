@@ -0,0 +1,309 @@
+"""
+Offline benchmark for the scanner.
+
+Every platform in platforms.yml is emulated by an in-process httpx.MockTransport,
+with configurable latency, found / not-found bodies, 429 bursts and connection
+resets, so a run measures ProScannerCore end to end without touching real sites.
+The report is JSON, meant to be stored and compared across commits:
+
+    python -m src.benchmark --usernames 2000 --output bench.json
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import resource
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List, Optional
+
+import httpx
+
+from src.config import ConfigManager
+from src.core import ProScannerCore
+from src.db.database_manager import DatabaseManager
+from src.detectors.engine import PlatformRules, compile_platforms
+from src.net.http_client import AsyncHttpClient
+
+# Set up logging for the benchmark
+logger = logging.getLogger(__name__)
+
+class LatencyModel:
+    """Draws simulated server response times, in seconds."""
+
+    DISTRIBUTIONS = ("fixed", "exponential", "lognormal")
+
+    def __init__(self, distribution: str = "lognormal", median_ms: float = 50.0, sigma: float = 0.5,
+                 rng: Optional[random.Random] = None):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"unknown latency distribution '{distribution}'")
+        self.distribution = distribution
+        self.median = median_ms / 1000.0
+        self.sigma = sigma
+        self.rng = rng or random.Random()
+
+    def sample(self) -> float:
+        if self.distribution == "fixed" or self.median <= 0:
+            return self.median
+        if self.distribution == "exponential":
+            # An exponential distribution's median is ln(2) times its mean
+            return self.rng.expovariate(0.6931471805599453 / self.median)
+        return self.rng.lognormvariate(0.0, self.sigma) * self.median
+
+def _put_json_path(document: Dict[str, Any], path: tuple, value: Any):
+    """Sets `value` at a compiled JSON path, creating the containers along the way."""
+    node = document
+    for key, next_key in zip(path, path[1:]):
+        empty = [] if isinstance(next_key, int) else {}
+        if isinstance(node, list):
+            node.extend([None] * (key + 1 - len(node)))
+            if node[key] is None:
+                node[key] = empty
+            node = node[key]
+        else:
+            node = node.setdefault(key, empty)
+    last = path[-1]
+    if isinstance(node, list):
+        node.extend([None] * (last + 1 - len(node)))
+        node[last] = value
+    elif last not in node:
+        node[last] = value
+
+class MockPlatforms:
+    """
+    An httpx transport handler that answers for every platform, routed by host.
+    Whether a username exists is decided by a hash, so every run sees the same answers.
+    """
+
+    def __init__(self, platforms: Dict[str, PlatformRules], latency: LatencyModel, found_ratio: float = 0.3,
+                 body_bytes: int = 50000, throttle_rate: float = 0.0, throttle_burst: int = 5,
+                 reset_rate: float = 0.0, rng: Optional[random.Random] = None):
+        self.latency = latency
+        self.found_ratio = found_ratio
+        self.body_bytes = body_bytes
+        self.throttle_rate = throttle_rate
+        self.throttle_burst = throttle_burst
+        self.reset_rate = reset_rate
+        self.rng = rng or random.Random()
+        self.routes: Dict[str, PlatformRules] = {}
+        for rules in platforms.values():
+            if rules.type != "unavailable":
+                self.routes[httpx.URL(rules.url_for("x")).host] = rules
+        self._throttled: Dict[str, int] = {}
+        self.counts = {"requests": 0, "throttled": 0, "resets": 0}
+
+    def exists(self, username: str) -> bool:
+        digest = hashlib.blake2b(username.lower().encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") / 2 ** 64 < self.found_ratio
+
+    def _username(self, rules: PlatformRules, request: httpx.Request) -> str:
+        """Recovers the username from a URL built from the platform's template."""
+        prefix, _, suffix = rules.url_template.partition("{}")
+        url = str(request.url)
+        return url[len(prefix):len(url) - len(suffix)] if url.startswith(prefix) else url
+
+    def _padded(self, text: str) -> bytes:
+        padding = max(0, self.body_bytes - len(text) - 26)
+        return b"<html><body>" + b"." * padding + text.encode() + b"</body></html>"
+
+    def _answer(self, rules: PlatformRules, username: str) -> httpx.Response:
+        found = self.exists(username)
+        if rules.is_json:
+            if not found:
+                if rules.found_path is not None:
+                    return httpx.Response(200, json={})
+                return httpx.Response(min(rules.not_found_status or {404}), json={"error": "not found"})
+            document: Dict[str, Any] = {}
+            for name, path in rules.detail_paths.items():
+                _put_json_path(document, path, f"{name}-{username}")
+            if rules.found_path is not None:
+                _put_json_path(document, rules.found_path, {"id": username})
+            return httpx.Response(min(rules.found_status), json=document)
+
+        if found:
+            markers = [marker.replace("{}", username) for marker in rules.found_markers]
+            return httpx.Response(min(rules.found_status), content=self._padded(" ".join(markers)))
+        if rules.not_found_markers:
+            return httpx.Response(min(rules.found_status), content=self._padded(rules.not_found_markers[0]))
+        return httpx.Response(min(rules.not_found_status or {404}), content=self._padded("Not Found"))
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.counts["requests"] += 1
+        await asyncio.sleep(self.latency.sample())
+        host = request.url.host
+        rules = self.routes.get(host)
+        if rules is None:
+            return httpx.Response(404)
+
+        if self.rng.random() < self.reset_rate:
+            self.counts["resets"] += 1
+            raise httpx.ReadError("Connection reset by peer", request=request)
+
+        # Once a burst starts, the host answers 429 for the next `throttle_burst` requests
+        remaining = self._throttled.get(host, 0)
+        if remaining == 0 and self.rng.random() < self.throttle_rate:
+            remaining = self.throttle_burst
+        if remaining:
+            self._throttled[host] = remaining - 1
+            self.counts["throttled"] += 1
+            return httpx.Response(429, headers={"Retry-After": "0"})
+
+        response = self._answer(rules, self._username(rules, request))
+        if request.method == "HEAD":
+            return httpx.Response(response.status_code)
+        return response
+
+def _percentile(ordered: List[float], percentile: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _count_rows(db_path: str) -> Dict[str, int]:
+    connection = sqlite3.connect(db_path)
+    try:
+        tables = [row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+        return {
+            table: connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in tables if not table.startswith("sqlite_")
+        }
+    finally:
+        connection.close()
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Runs one scan of generated usernames against the mock platforms and returns the report."""
+    rng = random.Random(args.seed)
+    platforms = compile_platforms(ConfigManager().get_platforms())
+    mock = MockPlatforms(
+        platforms,
+        LatencyModel(args.latency, args.latency_ms, args.latency_sigma, rng),
+        found_ratio=args.found_ratio,
+        body_bytes=args.body_bytes,
+        throttle_rate=args.throttle_rate,
+        throttle_burst=args.throttle_burst,
+        reset_rate=args.reset_rate,
+        rng=rng
+    )
+
+    workdir = tempfile.mkdtemp(prefix="pro_scanner_bench_")
+    DatabaseManager.DB_NAME = os.path.join(workdir, "bench.db")
+    AsyncHttpClient.transport = httpx.MockTransport(mock)
+
+    scanner = ProScannerCore(use_cache=False)
+    await scanner._ensure_ready()
+    scanner.http_client.rate_limiter.enabled = args.rate_limit
+
+    # Time every (username, platform) check as the scanner sees it, retries included
+    latencies: List[float] = []
+    failures: List[str] = []
+    for detector in scanner.detectors.values():
+        def timed(scan, detector=detector):
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await scan(*args, **kwargs)
+                except Exception as e:
+                    # A detector should turn every failure into an ERROR result
+                    failures.append(f"{detector.rules.key}: {type(e).__name__}: {e}")
+                    raise
+                finally:
+                    if detector.rules.type != "unavailable":
+                        latencies.append(time.perf_counter() - started)
+            return wrapper
+        detector.scan = timed(detector.scan)
+
+    usernames = [f"bench_user_{i}" for i in range(args.usernames)]
+    statuses: Dict[str, int] = {}
+    started = time.perf_counter()
+    try:
+        async for event in scanner.scan_stream(usernames, concurrency=args.concurrency):
+            statuses[event["status"]] = statuses.get(event["status"], 0) + 1
+    finally:
+        await scanner.close()
+        AsyncHttpClient.transport = None
+    elapsed = time.perf_counter() - started
+
+    rows = _count_rows(DatabaseManager.DB_NAME)
+    shutil.rmtree(workdir, ignore_errors=True)
+    latencies.sort()
+    return {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "parameters": {key: value for key, value in vars(args).items() if key != "output"},
+        "platforms": sorted(rules.key for rules in mock.routes.values()),
+        "elapsed_seconds": round(elapsed, 3),
+        "checks": sum(statuses.values()),
+        "expected_checks": args.usernames * len(scanner.detectors),
+        "statuses": statuses,
+        "check_exceptions": len(failures),
+        "first_exceptions": failures[:5],
+        "requests": mock.counts["requests"],
+        "requests_per_second": round(mock.counts["requests"] / elapsed, 1) if elapsed else 0.0,
+        "throttled_responses": mock.counts["throttled"],
+        "connection_resets": mock.counts["resets"],
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50) * 1000, 2),
+            "p95": round(_percentile(latencies, 95) * 1000, 2),
+            "p99": round(_percentile(latencies, 99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        },
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1),
+        "db_rows": rows,
+        "db_rows_per_second": round(sum(rows.values()) / elapsed, 1) if elapsed else 0.0,
+    }
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m src.benchmark", description="Offline end-to-end scanner benchmark.")
+    parser.add_argument("--usernames", type=int, default=1000, help="Usernames to scan (default 1000).")
+    parser.add_argument("--concurrency", type=int, default=None, help="Scanner concurrency (default from settings.yml).")
+    parser.add_argument("--latency", choices=LatencyModel.DISTRIBUTIONS, default="lognormal", help="Server latency distribution.")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Median server latency in milliseconds.")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Spread of the lognormal distribution.")
+    parser.add_argument("--found-ratio", type=float, default=0.3, help="Share of usernames that exist on a platform.")
+    parser.add_argument("--body-bytes", type=int, default=50000, help="Size of generated HTML pages.")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Chance per request that a host starts a 429 burst.")
+    parser.add_argument("--throttle-burst", type=int, default=5, help="Requests answered 429 once a burst starts.")
+    parser.add_argument("--reset-rate", type=float, default=0.0, help="Chance per request of a connection reset.")
+    parser.add_argument("--rate-limit", action="store_true", help="Keep the client-side rate limiter on (off by default).")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed, for repeatable runs.")
+    parser.add_argument("--output", metavar="FILE", help="Write the JSON report to FILE instead of stdout.")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    """Prints or writes the report. Returns 1 if any check raised or went missing, so CI notices."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="[%(levelname)s] %(message)s")
+    report = asyncio.run(run_benchmark(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if report["check_exceptions"] or report["checks"] < report["expected_checks"]:
+        print(
+            f"benchmark: {report['check_exceptions']} check(s) raised, "
+            f"{report['checks']} of {report['expected_checks']} completed", file=sys.stderr
+        )
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
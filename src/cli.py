@@ -0,0 +1,251 @@
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from typing import List, Optional
+
+# Only the standard library is imported up front. `scan` pulls in the scanner core
+# (httpx, aiosqlite) when it runs and never loads rich, so the time from launch to the
+# first request stays small enough for cron jobs and shell pipelines. `serve` runs the
+# long-lived job service in src.service, `history` queries saved results and `export`
+# streams them to a file. Every other command is handed to the interactive application
+# in src.main.
+
+def _scan_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pro_scanner scan",
+        description="Scan usernames without the interactive menu and write one result per line."
+    )
+    parser.add_argument("usernames", nargs="*", metavar="USERNAME", help="Usernames to scan.")
+    parser.add_argument("--input", "-i", metavar="FILE", help="Also scan the usernames in FILE ('-' for stdin).")
+    parser.add_argument("--variants", action="append", metavar="NAME", default=[],
+                        help="Also scan handles generated from NAME, e.g. \"John Doe\" (repeatable).")
+    parser.add_argument("--variant-limit", type=int, default=200, metavar="N", help="Variants per NAME, likeliest first (default: 200).")
+    parser.add_argument("--years", metavar="LIST", help="Comma-separated years to append to variants, e.g. 1990,2001.")
+    parser.add_argument("--platforms", "-p", metavar="LIST", help="Comma-separated platform keys to scan (default: all enabled).")
+    parser.add_argument("--format", "-f", choices=("ndjson", "text"), default="ndjson", help="Output format (default: ndjson).")
+    parser.add_argument("--output", "-o", metavar="FILE", help="Append results to FILE instead of writing them to stdout.")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached results and query every platform again.")
+    parser.add_argument("--stale-only", action="store_true",
+                        help="Re-check only results older than --max-age; newer ones are reused as they are.")
+    parser.add_argument("--max-age", type=float, metavar="HOURS", help="With --stale-only, the age in hours after which a result is re-checked (default from settings.yml).")
+    parser.add_argument("--workers", type=int, metavar="N", help="Shard the scan across N worker processes.")
+    parser.add_argument("--concurrency", type=int, metavar="N", help="Max in-flight requests (default from settings.yml).")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log progress to stderr.")
+    return parser
+
+def _serve_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pro_scanner serve",
+        description="Run a long-lived scan service with a local HTTP job API (see src/service.py)."
+    )
+    parser.add_argument("--host", help="Interface to listen on (default from settings.yml).")
+    parser.add_argument("--port", type=int, help="TCP port to listen on (default from settings.yml).")
+    parser.add_argument("--socket", metavar="PATH", help="Listen on a Unix socket instead of TCP.")
+    parser.add_argument("--concurrency", type=int, metavar="N", help="Max in-flight checks across all jobs.")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log every job and request to stderr.")
+    return parser
+
+async def run_service(args: argparse.Namespace) -> int:
+    from src.service import ScanService
+
+    service = ScanService.from_config(
+        host=args.host, port=args.port, socket_path=args.socket, concurrency=args.concurrency
+    )
+    await service.serve_forever()
+    return 0
+
+def _history_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pro_scanner history",
+        description="Query saved scan results and write one JSON object per line."
+    )
+    parser.add_argument("username", nargs="?", metavar="USERNAME", help="Show the latest status of USERNAME on every platform.")
+    parser.add_argument("--site", metavar="PLATFORM", help="List results on PLATFORM (a key from platforms.yml).")
+    parser.add_argument("--status", default="FOUND", help="With --site, the status to list (default: FOUND).")
+    parser.add_argument("--since", metavar="WHEN", help="With --site, only results since WHEN (ISO date/time or Unix time).")
+    parser.add_argument("--sessions", action="store_true", help="List scan sessions, newest first (of USERNAME if given).")
+    parser.add_argument("--limit", type=int, metavar="N", help="Stop after N rows.")
+    return parser
+
+def _export_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pro_scanner export",
+        description="Stream the saved scan history (results joined with their sessions) to a file."
+    )
+    parser.add_argument("--format", "-f", choices=("csv", "ndjson", "parquet"), default="csv", help="Output format (default: csv; parquet needs pyarrow).")
+    parser.add_argument("--output", "-o", default="-", metavar="FILE", help="File to write ('-' for stdout, the default).")
+    parser.add_argument("--since", metavar="WHEN", help="Only results scanned at or after WHEN (ISO date/time or Unix time).")
+    parser.add_argument("--until", metavar="WHEN", help="Only results scanned before WHEN.")
+    parser.add_argument("--platforms", "-p", metavar="LIST", help="Comma-separated platform keys to include.")
+    parser.add_argument("--status", metavar="LIST", help="Comma-separated statuses to include, e.g. FOUND,NOT_FOUND.")
+    parser.add_argument("--chunk-size", type=int, default=10000, metavar="N", help="Rows read per query (default: 10000).")
+    return parser
+
+async def run_export(args: argparse.Namespace) -> int:
+    from src.db.database_manager import DatabaseManager
+    from src.export import export_history
+
+    def split(value: Optional[str]) -> Optional[List[str]]:
+        return [item.strip() for item in value.split(",") if item.strip()] if value else None
+
+    db_manager = DatabaseManager()
+    try:
+        await export_history(
+            db_manager, args.output, args.format,
+            since=_parse_since(args.since) if args.since else None,
+            until=_parse_since(args.until) if args.until else None,
+            platforms=split(args.platforms),
+            statuses=[status.upper() for status in split(args.status) or ()] or None,
+            chunk_size=max(1, args.chunk_size)
+        )
+    except ValueError as e:
+        print(f"pro_scanner export: {e}", file=sys.stderr)
+        return 2
+    finally:
+        await db_manager.close()
+    return 0
+
+def _parse_since(value: Optional[str]) -> float:
+    if not value:
+        return 0.0
+    try:
+        return float(value)
+    except ValueError:
+        import datetime
+        return datetime.datetime.fromisoformat(value).timestamp()
+
+async def run_history(args: argparse.Namespace) -> int:
+    from src.db.database_manager import DatabaseManager
+
+    db_manager = DatabaseManager()
+    try:
+        if args.sessions:
+            rows = db_manager.iter_sessions(args.username)
+        elif args.site:
+            rows = db_manager.iter_results(args.site, args.status.upper(), _parse_since(args.since))
+        else:
+            async def latest():
+                for row in (await db_manager.get_latest_statuses(args.username)).values():
+                    yield row
+            rows = latest()
+        count = 0
+        async for row in rows:
+            sys.stdout.write(json.dumps(row, default=str) + "\n")
+            count += 1
+            if args.limit is not None and count >= args.limit:
+                break
+    finally:
+        await db_manager.close()
+    return 0 if count else 1
+
+async def _usernames(args: argparse.Namespace):
+    """Yields the usernames given on the command line, then the --variants, then those from --input."""
+    from src.utils.input_stream import UsernameStream, normalize_username
+    from src.utils.variants import generate_sweep
+
+    for username in args.usernames:
+        username = normalize_username(username)
+        if username:
+            yield username
+    if args.variants:
+        years = [int(year) for year in args.years.split(",") if year.strip()] if args.years else ()
+        for username in generate_sweep(args.variants, limit_per_name=args.variant_limit, years=years):
+            yield username
+    if args.input:
+        async for username in UsernameStream(args.input):
+            yield username
+
+def _format_text(result: dict) -> str:
+    return "\t".join(str(result.get(key) or "") for key in ("username", "site", "status", "url", "error"))
+
+async def run_scan(args: argparse.Namespace) -> int:
+    """Streams every result to stdout or --output. Returns the process exit code."""
+    from src.core import ProScannerCore
+
+    platforms = [key.strip() for key in args.platforms.split(",") if key.strip()] if args.platforms else None
+    if args.stale_only and args.no_cache:
+        print("pro_scanner scan: --stale-only reuses cached results and cannot be combined with --no-cache", file=sys.stderr)
+        return 2
+    stale_after = None
+    if args.stale_only:
+        from src.config import ConfigManager
+
+        stale_after = args.max_age if args.max_age is not None else ConfigManager().get_setting("scanner.stale_after_hours", 24)
+    try:
+        scanner = ProScannerCore(
+            use_cache=not args.no_cache, workers=args.workers, platforms=platforms, show_progress=False,
+            stale_after_hours=stale_after
+        )
+    except ValueError as e:
+        print(f"pro_scanner scan: {e}", file=sys.stderr)
+        return 2
+
+    out = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    formatter = _format_text if args.format == "text" else (lambda result: json.dumps(result, default=str))
+    count = 0
+    try:
+        async for result in scanner.scan_stream(_usernames(args), concurrency=args.concurrency):
+            out.write(formatter(result) + "\n")
+            out.flush()
+            count += 1
+    finally:
+        await scanner.close()
+        if out is not sys.stdout:
+            out.close()
+    if count == 0:
+        print("pro_scanner scan: no usernames to scan", file=sys.stderr)
+        return 1
+    return 0
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Console entry point (`pro_scanner`)."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "serve":
+        args = _serve_parser().parse_args(argv[1:])
+        logging.basicConfig(
+            level=logging.INFO if args.verbose else logging.WARNING,
+            format="[%(asctime)s] - [%(levelname)s] - %(message)s",
+            datefmt="%H:%M:%S",
+            stream=sys.stderr
+        )
+        try:
+            return asyncio.run(run_service(args))
+        except KeyboardInterrupt:
+            return 0
+    if argv and argv[0] == "history":
+        args = _history_parser().parse_args(argv[1:])
+        if not args.username and not args.site and not args.sessions:
+            _history_parser().error("give a USERNAME, --site PLATFORM or --sessions")
+        logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+        return asyncio.run(run_history(args))
+    if argv and argv[0] == "export":
+        args = _export_parser().parse_args(argv[1:])
+        logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+        return asyncio.run(run_export(args))
+    if not argv or argv[0] != "scan":
+        from src.main import main as interactive_main, parse_args
+        try:
+            asyncio.run(interactive_main(parse_args(argv)))
+        except KeyboardInterrupt:
+            logging.info("Scan cancelled by user. Exiting.")
+        return 0
+
+    args = _scan_parser().parse_args(argv[1:])
+    if not args.usernames and not args.input and not args.variants:
+        _scan_parser().error("give at least one USERNAME, --variants NAME or --input FILE")
+    # Results go to stdout, so diagnostics stay on stderr and quiet by default
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="[%(asctime)s] - [%(levelname)s] - %(message)s",
+        datefmt="%H:%M:%S",
+        stream=sys.stderr
+    )
+    try:
+        return asyncio.run(run_scan(args))
+    except KeyboardInterrupt:
+        return 130
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
-import yaml
 import os
+import json
 import logging
 from typing import Dict, Any, Optional
 
@@ -23,13 +23,27 @@ class ConfigManager:
             cls._instance._load_configs()
         return cls._instance
 
+    # Parsed YAML is cached here as JSON, which loads far faster than YAML
+    # and lets a cold start skip importing the YAML parser altogether.
+    CACHE_FILENAME = ".compiled_config.json"
+
     def _load_configs(self):
-        """Loads configuration from YAML files."""
+        """Loads configuration from the compiled cache, or from the YAML files when it is stale."""
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         config_dir = os.path.join(base_dir, 'config')
 
         settings_path = os.path.join(config_dir, 'settings.yml')
         platforms_path = os.path.join(config_dir, 'platforms.yaml')
+        if not os.path.exists(platforms_path):
+            # The shipped file uses the short extension
+            platforms_path = os.path.join(config_dir, 'platforms.yml')
+
+        cache_path = os.path.join(config_dir, self.CACHE_FILENAME)
+        stamp = self._stamp(settings_path, platforms_path)
+        if self._load_cache(cache_path, stamp):
+            return
+
+        import yaml
 
         try:
             with open(settings_path, 'r') as f:
@@ -37,17 +51,57 @@ class ConfigManager:
             logger.info("✅ Successfully loaded settings from settings.yml")
         except FileNotFoundError:
             logger.error(f"❌ Error: 'settings.yml' not found at {settings_path}")
+            stamp = None
         except yaml.YAMLError as e:
             logger.error(f"❌ Error parsing 'settings.yml': {e}")
+            stamp = None
         
         try:
             with open(platforms_path, 'r') as f:
-                self._platforms = yaml.safe_load(f)
+                self._platforms = (yaml.safe_load(f) or {}).get('platforms', {})
             logger.info("✅ Successfully loaded platforms from platforms.yaml")
         except FileNotFoundError:
             logger.error(f"❌ Error: 'platforms.yaml' not found at {platforms_path}")
+            stamp = None
         except yaml.YAMLError as e:
             logger.error(f"❌ Error parsing 'platforms.yaml': {e}")
+            stamp = None
+
+        # Only a clean load is worth caching
+        if stamp is not None:
+            self._save_cache(cache_path, stamp)
+
+    @staticmethod
+    def _stamp(*paths: str) -> Optional[list]:
+        """Identifies the current version of the config files by path, mtime and size."""
+        try:
+            return [[path, os.stat(path).st_mtime_ns, os.stat(path).st_size] for path in paths]
+        except OSError:
+            return None
+
+    def _load_cache(self, cache_path: str, stamp: Optional[list]) -> bool:
+        if stamp is None:
+            return False
+        try:
+            with open(cache_path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if cached.get("stamp") != stamp:
+            return False
+        self._settings = cached["settings"]
+        self._platforms = cached["platforms"]
+        return True
+
+    def _save_cache(self, cache_path: str, stamp: list):
+        try:
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({"stamp": stamp, "settings": self._settings, "platforms": self._platforms}, f)
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            # A read-only install just parses the YAML every time
+            logger.debug(f"Could not write the config cache: {e}")
 
     def get_setting(self, key: str, default: Optional[Any] = None) -> Any:
         """Retrieves a setting by key, with an optional default value."""
@@ -62,7 +116,7 @@ class ConfigManager:
         return value
 
     def get_platforms(self) -> Dict[str, Any]:
-        """Returns the dictionary of all platforms."""
+        """Returns the dictionary of all platforms, keyed by platform name."""
         return self._platforms
 
     def get_platform_details(self, site_name: str) -> Optional[Dict[str, Any]]:
@@ -1,43 +1,279 @@
 import asyncio
-import httpx
-import yaml
-from typing import Dict, List, Any
+import datetime
+import functools
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Any, Iterable, Optional, AsyncIterable, AsyncIterator, Awaitable, Callable, Tuple, Union, TYPE_CHECKING
 
+from src.config import ConfigManager
 from src.net.http_client import AsyncHttpClient
-from src.net.user_agents import UserAgentManager
-from src.detectors.instagram import InstagramDetector
+from src.net.concurrency import ConcurrencyController
+from src.net.circuit_breaker import CircuitBreakers
+from src.detectors.engine import DeclarativeDetector, PlatformRules, compile_platforms
 from src.db.database_manager import DatabaseManager
-from src.utils.cli_utils import ProgressBar
+from src.db.result_cache import ResultCache
+from src.db.negative_filter import NegativeFilter
+from src.assets import AvatarDownloader
+from src.jobs import ScanJob
+from src.metrics import MetricsRegistry, MetricsExporter
+
+if TYPE_CHECKING:
+    # rich is only imported when a progress bar is actually shown
+    from src.utils.cli_utils import ProgressBar
+
+# Set up logging for the scanner core
+logger = logging.getLogger(__name__)
+
+CHECK_OUTCOMES = MetricsRegistry().counter(
+    "pro_scanner_checks_total", "Completed (username, platform) checks by outcome.", ("platform", "outcome")
+)
+CACHE_HITS = MetricsRegistry().counter(
+    "pro_scanner_cache_hits_total", "Checks answered from the result cache without a request.", ("platform",)
+)
+REVALIDATED = MetricsRegistry().counter(
+    "pro_scanner_revalidated_total", "Expired cached results confirmed unchanged by a 304 response.", ("platform",)
+)
+COALESCED = MetricsRegistry().counter(
+    "pro_scanner_coalesced_total", "Checks answered by an identical lookup already in flight.", ("platform",)
+)
+
+class NullProgressBar:
+    """Stands in for ProgressBar when no progress should be drawn (scripts, worker processes)."""
+
+    def update(self, advance: int = 1):
+        pass
+
+    def close(self):
+        pass
+
+# Usernames may come from a list or be streamed lazily from a file or stdin
+Usernames = Union[Iterable[str], AsyncIterable[str]]
+
+async def _aiter_usernames(usernames: Usernames) -> AsyncIterator[str]:
+    """Iterates plain and async username sources alike."""
+    if hasattr(usernames, "__aiter__"):
+        async for username in usernames:
+            yield username
+    else:
+        for username in usernames:
+            yield username
 
 class ProScannerCore:
-    def __init__(self):
+    DEFAULT_CONCURRENCY = 50
+
+    def __init__(self, use_cache: bool = True, workers: Optional[int] = None,
+                 platforms: Optional[Iterable[str]] = None, show_progress: bool = True,
+                 stale_after_hours: Optional[float] = None):
         self.db_manager = DatabaseManager()
-        self.http_client = AsyncHttpClient()
-        
-        with open("config/platforms.yaml", "r") as f:
-            self.platforms = yaml.safe_load(f)["platforms"]
+        self.use_cache = use_cache
+        # With more than one worker, batch scans are sharded across processes
+        self.workers = max(1, workers or ConfigManager().get_setting("scanner.workers", 1))
+        # Worker processes leave caching and sessions to the aggregating process
+        self.persist = True
+        self.cache = ResultCache.from_config(self.db_manager)
+        # Accounts recently confirmed absent are skipped before any request
+        self.negatives = NegativeFilter.from_config(self.db_manager)
+        # Expired cached results are revalidated with If-None-Match / If-Modified-Since
+        self.conditional = ConfigManager().get_setting("scanner.conditional_requests", True)
+        # Stale-only re-scans reuse anything checked within this many seconds, whatever the platform TTL
+        self.stale_after: Optional[float] = None if stale_after_hours is None else stale_after_hours * 3600
+        # Profile pictures of FOUND accounts are fetched in the background (None when disabled)
+        self.assets = AvatarDownloader.from_config(self.db_manager)
+        # The shared client and detectors are created on first use, inside the event loop
+        self.http_client: Optional[AsyncHttpClient] = None
+        self.metrics_exporter: Optional[MetricsExporter] = None
+        self._prewarm_task: Optional[asyncio.Task] = None
+        self.detectors: Dict[str, DeclarativeDetector] = {}
+        self.concurrency = ConfigManager().get_setting("scanner.concurrency", self.DEFAULT_CONCURRENCY)
+        # Per-platform windows inside the global limit, tuned from each platform's responses
+        self.windows = ConcurrencyController.from_config()
+        # Platforms that keep failing are answered UNAVAILABLE instead of timing out
+        self.breakers = CircuitBreakers.from_config()
+        # (platform, account key) -> the answer of the lookup currently in flight
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        # ...and conclusive answers from the last few minutes, shared even without the cache
+        self._recent: "OrderedDict[Tuple[str, str], Tuple[Dict, float]]" = OrderedDict()
+        self.coalesce_ttl = ConfigManager().get_setting("scanner.coalesce_ttl_seconds", 300)
+        self.coalesce_max_entries = ConfigManager().get_setting("scanner.coalesce_max_entries", 10000)
+
+        self.show_progress = show_progress
+
+        # Every enabled platform's rules are compiled once, up front. `platforms`
+        # narrows the scan to the named ones, so nothing else is compiled.
+        configured = ConfigManager().get_platforms()
+        if platforms is not None:
+            wanted = set(platforms)
+            unknown = wanted - set(configured)
+            if unknown:
+                raise ValueError(f"Unknown platform(s): {', '.join(sorted(unknown))}")
+            configured = {key: value for key, value in configured.items() if key in wanted}
+        self.platforms: Dict[str, PlatformRules] = compile_platforms(configured)
+
+    async def _ensure_ready(self):
+        """Fetches the pooled AsyncHttpClient singleton and injects it into every detector."""
+        if self.http_client is None:
+            # Worker processes report through the aggregator, which owns the exporter
+            if self.persist:
+                self.metrics_exporter = MetricsExporter.from_config()
+                if self.metrics_exporter is not None:
+                    await self.metrics_exporter.start()
+            self.http_client = await AsyncHttpClient.get_instance()
+            for site_name, rules in self.platforms.items():
+                if rules.type != "unavailable":
+                    self.windows.bind(site_name, rules.url_for(""))
+            self.http_client.observers.append(self.windows.observe)
+            if ConfigManager().get_setting("network.prewarm", False):
+                # Runs while the caller is still reading its input; not awaited
+                urls = [rules.url_for("") for rules in self.platforms.values() if rules.type != "unavailable"]
+                self._prewarm_task = asyncio.create_task(self.http_client.prewarm(urls))
+            self.detectors = {
+                site_name: DeclarativeDetector(self.http_client, rules)
+                for site_name, rules in self.platforms.items()
+            }
+
+    def _progress_bar(self, total: Optional[int], desc: str):
+        """Returns a live progress bar, or a silent stand-in when progress is hidden."""
+        if not self.show_progress:
+            return NullProgressBar()
+        from src.utils.cli_utils import ProgressBar
+        return ProgressBar(total=total, desc=desc)
+
+    def _dispatchable_platforms(self) -> List[tuple]:
+        """Returns the (site_name, rules) pairs of every enabled platform."""
+        return list(self.platforms.items())
+
+    async def _scan_site(self, username: str, site_name: str, rules: PlatformRules, progress_bar: "ProgressBar") -> Dict:
+        """
+        Runs a single (username, platform) check. Concurrent checks of the same account,
+        by the platform's case-folding rules, share one lookup: duplicates in a batch or
+        from different callers cost a single request.
+        """
+        key = (site_name, rules.account_key(username))
+        recent = self._recent.get(key)
+        pending = self._inflight.get(key)
+        if recent is not None and time.monotonic() - recent[1] < self.coalesce_ttl:
+            result = recent[0]
+        elif pending is not None:
+            try:
+                result = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The lookup we were waiting for was abandoned; run our own
+                return await self._scan_site(username, site_name, rules, progress_bar)
+        else:
+            result = None
+        if result is not None:
+            progress_bar.update()
+            COALESCED.labels(site_name).inc()
+            CHECK_OUTCOMES.labels(site_name, result.get("status")).inc()
+            return dict(result, coalesced=True)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._check_site(username, site_name, rules, progress_bar)
+            future.set_result(result)
+            if self.coalesce_ttl > 0 and result.get("status") in ResultCache.CACHEABLE_STATUSES:
+                self._recent[key] = (result, time.monotonic())
+                self._recent.move_to_end(key)
+                if len(self._recent) > self.coalesce_max_entries:
+                    self._recent.popitem(last=False)
+            return result
+        finally:
+            if not future.done():
+                future.cancel()
+            del self._inflight[key]
+
+    async def _check_site(self, username: str, site_name: str, rules: PlatformRules, progress_bar: "ProgressBar") -> Dict:
+        """Runs a single (username, platform) check through its detector, consulting the cache first."""
+        previous = None
+        if self.use_cache:
+            cached = await self.cache.get(site_name, username, max_age=self.stale_after)
+            if cached is not None:
+                progress_bar.update()
+                CACHE_HITS.labels(site_name).inc()
+                CHECK_OUTCOMES.labels(site_name, cached.get("status")).inc()
+                return dict(cached, cached=True)
+            if await self.negatives.known_absent(site_name, rules.account_key(username)):
+                progress_bar.update()
+                CHECK_OUTCOMES.labels(site_name, "NOT_FOUND").inc()
+                return dict(
+                    self.detectors[site_name].format_result(status="NOT_FOUND", url=rules.url_for(username)),
+                    cached=True, known_absent=True
+                )
+            if self.conditional:
+                # An expired entry can still spare the download if the profile has not changed
+                previous = await self.cache.get_revalidatable(site_name, username)
+
+        detector = self.detectors[site_name]
+        breaker = self.breakers.get(site_name)
+        if breaker is not None and not breaker.allow():
+            progress_bar.update()
+            CHECK_OUTCOMES.labels(site_name, "UNAVAILABLE").inc()
+            return detector.format_result(
+                status="UNAVAILABLE", url=rules.url_for(username),
+                error=f"Skipped: {rules.name} keeps failing (retrying in {breaker.retry_in:.0f}s)"
+            )
+
+        outcome = None
+        try:
+            result = await detector.scan(username, previous[1] if previous else None)
+            if result.get("status") == "NOT_MODIFIED":
+                REVALIDATED.labels(site_name).inc()
+                result = dict(previous[0], validators=result.get("validators") or previous[1], revalidated=True)
+            outcome = result.get("status") != "ERROR"
+            if self.persist:
+                await self.remember(site_name, rules, username, result)
+        except ValueError as e:
+            # A failed site must not take down the rest of the batch
+            outcome = False
+            result = {
+                "site": rules.name,
+                "status": "ERROR",
+                "url": rules.url_for(username),
+                "error": str(e)
+            }
+        finally:
+            if breaker is not None:
+                breaker.record(outcome)
+            progress_bar.update()
+        CHECK_OUTCOMES.labels(site_name, result.get("status")).inc()
+        return result
+
+    async def remember(self, site_name: str, rules: PlatformRules, username: str, result: Dict):
+        """
+        Stores a fresh result in the result cache, a NOT_FOUND in the negative filter,
+        and queues the profile picture of a FOUND account for download.
+        """
+        await self.cache.set(site_name, username, result)
+        if self.assets is not None and not result.get("revalidated"):
+            self.assets.submit(site_name, username, result)
+        if result.get("status") == "NOT_FOUND" and rules.type != "unavailable":
+            await self.negatives.add(site_name, rules.account_key(username))
 
     async def scan_username(self, username: str) -> Dict[str, Any]:
         """Orchestrates the full scan workflow."""
+        await self._ensure_ready()
         start_time = asyncio.get_event_loop().time()
+        sites = self._dispatchable_platforms()
         
         # We can add a simple progress bar here
-        progress_bar = ProgressBar(total=len(self.platforms), desc="Scanning platforms")
-        
-        tasks = []
-        for site_name, config in self.platforms.items():
-            # Create tasks for each platform
-            if site_name == "instagram":
-                task = self.scan_instagram(username, config, progress_bar)
-                tasks.append(task)
-            # Add logic for other platforms here (e.g., twitter, github)
+        progress_bar = self._progress_bar(len(sites), "Scanning platforms")
         
-        results = await asyncio.gather(*tasks)
+        async def check(site_name: str, rules: PlatformRules) -> Dict:
+            async with self.windows.window(site_name).slot():
+                return await self._scan_site(username, site_name, rules, progress_bar)
+
+        results = await asyncio.gather(*(check(site_name, rules) for site_name, rules in sites))
         
         duration = asyncio.get_event_loop().time() - start_time
         
         # Save session to database
-        await self.db_manager.save_session(username, len(results), duration)
+        await self.db_manager.save_session(
+            username, len(results), duration, zip((site_name for site_name, _ in sites), results)
+        )
 
         return {
             "username": username,
@@ -45,36 +281,223 @@ class ProScannerCore:
             "duration": round(duration, 2)
         }
 
-    async def scan_instagram(self, username: str, config: Dict, progress_bar: ProgressBar) -> Dict:
-        """Handles the specific Instagram scanning logic."""
-        full_url = config["api_url"].format(username)
-        headers = UserAgentManager.get_random_profile()
-        
-        response = await self.http_client.get(full_url, headers=headers)
-        
-        if response.status_code == 200:
-            raw_data = response.json()
-            if raw_data.get("user"):
-                detector = InstagramDetector()
-                details = await detector.get_details({"data": {"user": raw_data["user"]}})
-                
-                if details:
-                    # Logic to download profile picture
-                    # ...
-                    status = "FOUND"
-                    self.db_manager.save_result(username, "instagram", status, details)
-                else:
-                    status = "NOT_FOUND"
-            else:
-                status = "NOT_FOUND"
-        else:
-            status = "ERROR"
-        
-        progress_bar.update()
-        
-        return {
-            "site": "Instagram",
-            "status": status,
-            "url": full_url
-        }
+    async def _run_grid(self, usernames: Usernames, concurrency: int, progress_bar: "ProgressBar",
+                        on_result: Callable[[int, str, int, Dict], Awaitable[None]],
+                        on_username_done: Optional[Callable[[int, str, float], Awaitable[None]]] = None,
+                        job: Optional[ScanJob] = None):
+        """
+        Drives the usernames x platforms grid with at most `concurrency` checks in flight.
+        `on_result(index, username, slot, result)` is awaited as each cell completes and
+        `on_username_done(index, username, duration)` once all of a username's platforms have.
+        Usernames are pulled lazily and forgotten once finished, so memory stays flat; the
+        bounded per-platform queues apply backpressure to the source when checks are slow.
+        Each platform is dispatched separately within its adaptive window, so a platform
+        that throttles us only holds back its own queue, never the others.
+        With a `job`, pairs completed by an earlier run are skipped and progress is recorded.
+        With more than one worker the grid is handed to worker processes instead.
+        """
+        if self.workers > 1:
+            from src.workers import run_sharded_grid
+            await run_sharded_grid(self, usernames, self.workers, concurrency, progress_bar,
+                                   on_result, on_username_done, job=job)
+            return
+
+        sites = self._dispatchable_platforms()
+        loop = asyncio.get_event_loop()
+        # index -> [platforms still pending, time the first platform started, (platform, result) pairs]
+        inflight: Dict[int, List] = {}
+        queues: Dict[str, asyncio.Queue] = {site_name: asyncio.Queue(maxsize=concurrency * 2) for site_name, _ in sites}
+        total_slots = asyncio.Semaphore(concurrency)
+        running = set()
+        # Exceptions of failed checks, collected as their tasks finish so none is lost
+        errors: List[BaseException] = []
+
+        async def produce():
+            try:
+                index = 0
+                async for username in _aiter_usernames(usernames):
+                    cells = [
+                        (slot, site_name, rules) for slot, (site_name, rules) in enumerate(sites)
+                        if job is None or not job.is_done(index, site_name)
+                    ]
+                    if not cells:
+                        # Finished by an earlier run of this job
+                        progress_bar.update(len(sites))
+                        await job.complete(index)
+                        index += 1
+                        continue
+                    progress_bar.update(len(sites) - len(cells))
+                    inflight[index] = [len(cells), None, []]
+                    for slot, site_name, rules in cells:
+                        await queues[site_name].put((index, username, slot, site_name, rules))
+                    index += 1
+            finally:
+                for queue in queues.values():
+                    await queue.put(None)
+
+        async def run_cell(index: int, username: str, slot: int, site_name: str, rules: PlatformRules):
+            state = inflight[index]
+            if state[1] is None:
+                state[1] = loop.time()
+            result = await self._scan_site(username, site_name, rules, progress_bar)
+            await on_result(index, username, slot, result)
+            if job is not None:
+                await job.record(index, site_name)
+            if self.persist:
+                state[2].append((site_name, result))
+            state[0] -= 1
+            if state[0] == 0:
+                del inflight[index]
+                duration = loop.time() - state[1]
+                if self.persist:
+                    await self.db_manager.save_session(username, len(sites), duration, state[2])
+                if on_username_done is not None:
+                    await on_username_done(index, username, duration)
+                if job is not None:
+                    await job.complete(index)
+
+        async def dispatch(site_name: str):
+            queue = queues[site_name]
+            window = self.windows.window(site_name)
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                if errors:
+                    raise errors[0]
+                # The platform's own window first, so a throttled platform never holds a global slot
+                await window.acquire()
+                try:
+                    await total_slots.acquire()
+                except BaseException:
+                    window.release()
+                    raise
+                task = asyncio.create_task(run_cell(*item))
+                running.add(task)
+                task.add_done_callback(functools.partial(finished, window))
+
+        def finished(window, task: asyncio.Task):
+            running.discard(task)
+            window.release()
+            total_slots.release()
+            if not task.cancelled() and task.exception() is not None:
+                errors.append(task.exception())
+
+        feeders = [asyncio.ensure_future(produce())] + [asyncio.ensure_future(dispatch(site_name)) for site_name, _ in sites]
+        try:
+            await asyncio.gather(*feeders)
+            while running:
+                await asyncio.wait(set(running))
+            # Surface the first error raised by a check, as a gathered batch would
+            if errors:
+                raise errors[0]
+        finally:
+            for task in feeders + list(running):
+                task.cancel()
+
+    async def scan_many(self, usernames: Usernames, concurrency: Optional[int] = None,
+                        job: Optional[ScanJob] = None) -> List[Dict[str, Any]]:
+        """
+        Scans a batch of usernames across every platform.
+        The whole usernames x platforms grid is fed to a fixed pool of workers, so at most
+        `concurrency` requests are in flight at once regardless of the list length.
+        Returns one record per username, in input order, shaped like `scan_username`.
+        With a `job`, progress is checkpointed so an interrupted batch can be resumed.
+        """
+        await self._ensure_ready()
+        concurrency = max(1, concurrency or self.concurrency)
+        usernames = [username async for username in _aiter_usernames(usernames)]
+        sites = self._dispatchable_platforms()
+
+        records = [{"username": username, "results": [None] * len(sites), "duration": 0.0} for username in usernames]
+
+        async def collect(index: int, username: str, slot: int, result: Dict):
+            records[index]["results"][slot] = result
+
+        async def finish(index: int, username: str, duration: float):
+            records[index]["duration"] = round(duration, 2)
+
+        progress_bar = self._progress_bar(len(usernames) * len(sites), "Scanning usernames")
+        try:
+            await self._run_grid(usernames, concurrency, progress_bar, collect, finish, job=job)
+        finally:
+            progress_bar.close()
+        return records
+
+    async def scan_stream(self, usernames: Usernames, concurrency: Optional[int] = None,
+                          total: Optional[int] = None, job: Optional[ScanJob] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields one flat result per (username, site) the moment it completes, instead of
+        waiting for the whole batch. Nothing is accumulated, so memory stays flat however
+        long the run is. `total` is the number of usernames, if known, for the progress bar.
+        With a `job`, progress is checkpointed and pairs finished by an earlier run are skipped.
+        """
+        await self._ensure_ready()
+        concurrency = max(1, concurrency or self.concurrency)
+        sites = self._dispatchable_platforms()
+        events: asyncio.Queue = asyncio.Queue()
+        end_of_stream = object()
+
+        async def emit(index: int, username: str, slot: int, result: Dict):
+            # Wait until the consumer has handled the result, so a job never records
+            # progress for output that was lost in the queue when a run is interrupted.
+            handled = asyncio.get_event_loop().create_future()
+            await events.put(({"username": username, **result, "timestamp": datetime.datetime.now().isoformat()}, handled))
+            await handled
+
+        async def run():
+            try:
+                await self._run_grid(usernames, concurrency, progress_bar, emit, job=job)
+            finally:
+                await events.put(end_of_stream)
+
+        progress_bar = self._progress_bar(total * len(sites) if total is not None else None, "Scanning usernames")
+        runner = asyncio.create_task(run())
+        try:
+            while True:
+                item = await events.get()
+                if item is end_of_stream:
+                    break
+                event, handled = item
+                yield event
+                handled.set_result(None)
+            # Surface any error raised while scanning
+            await runner
+        finally:
+            if not runner.done():
+                runner.cancel()
+            progress_bar.close()
+
+    def platform_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns how many responses and body bytes each platform has cost so far."""
+        return {site_name: detector.stats.as_dict() for site_name, detector in self.detectors.items()}
+
+    def breaker_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the circuit breaker state of every platform that was skipped during the run."""
+        return self.breakers.summary()
 
+    async def close(self):
+        """Releases the shared connection pool and the database connection."""
+        for site_name, stats in self.platform_stats().items():
+            if stats["responses"]:
+                logger.info(f"{site_name}: {stats}")
+        for site_name, state in self.breakers.summary().items():
+            logger.info(f"🔌 {site_name} circuit: {state}")
+        windows = self.windows.snapshot()
+        if windows:
+            logger.info(f"🎚️ Final concurrency windows: {windows}")
+        if self._prewarm_task is not None:
+            self._prewarm_task.cancel()
+            self._prewarm_task = None
+        if self.assets is not None:
+            # Downloads still queued use the shared pool, so they finish before it closes
+            await self.assets.close()
+        if self.http_client is not None:
+            await self.http_client.close()
+            self.http_client = None
+        if self.persist:
+            await self.negatives.save()
+        await self.db_manager.close()
+        if self.metrics_exporter is not None:
+            await self.metrics_exporter.stop()
+            self.metrics_exporter = None
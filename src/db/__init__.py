@@ -1,2 +1,3 @@
 # This file declares the 'db' directory as a sub-package.
 from .database_manager import DatabaseManager
+from .result_cache import ResultCache
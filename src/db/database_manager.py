@@ -1,18 +1,50 @@
 import aiosqlite
+import asyncio
+import datetime
+import itertools
 import logging
-from typing import Optional, Dict, List, Any
+import time
+from typing import Optional, Dict, List, Any, Tuple, Iterable, AsyncIterator
+
+from src.config import ConfigManager
+from src.metrics import MetricsRegistry
 
 # Configure logging for the database manager
 logger = logging.getLogger(__name__)
 
+WRITE_QUEUE_DEPTH = MetricsRegistry().gauge(
+    "pro_scanner_db_write_queue_depth", "Writes waiting for the background writer when its last batch started."
+)
+FLUSH_LATENCY = MetricsRegistry().histogram(
+    "pro_scanner_db_flush_seconds", "Time taken to write and commit one batch."
+)
+ROWS_WRITTEN = MetricsRegistry().counter(
+    "pro_scanner_db_rows_written_total", "Rows written by the background writer."
+)
+
 class DatabaseManager:
     """
     Manages all database operations for the ProScanner application.
     Uses aiosqlite for an asynchronous interface with an SQLite database.
+    High-volume writes (results, cache entries) go through a background writer
+    that batches them into a few large transactions instead of one commit per row.
     """
     
     DB_NAME = "pro_scanner.db"
 
+    # Applied to every new connection. WAL lets readers proceed while the writer
+    # commits, and NORMAL sync is durable across application crashes in WAL mode.
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL;",
+        "PRAGMA synchronous=NORMAL;",
+        "PRAGMA temp_store=MEMORY;",
+        "PRAGMA cache_size=-65536;",
+        "PRAGMA busy_timeout=5000;",
+    )
+
+    # Sentinel telling the writer to drain and exit
+    _STOP = object()
+
     # Define the database schema using multiline strings
     CREATE_SESSIONS_TABLE = """
     CREATE TABLE IF NOT EXISTS scan_sessions (
@@ -24,6 +56,8 @@ class DatabaseManager:
     );
     """
 
+    # site_name holds the platform key from platforms.yml; username and scanned_at
+    # are copied from the session so history queries never need a join
     CREATE_RESULTS_TABLE = """
     CREATE TABLE IF NOT EXISTS scan_results (
         result_id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -36,34 +70,238 @@ class DatabaseManager:
         posts INTEGER,
         is_private BOOLEAN,
         is_verified BOOLEAN,
+        username TEXT,
+        scanned_at REAL,
+        url TEXT,
         FOREIGN KEY (session_id) REFERENCES scan_sessions (session_id)
     );
     """
+
+    # Columns added to scan_results after its first release, for databases created before them
+    RESULT_COLUMN_MIGRATIONS = (("username", "TEXT"), ("scanned_at", "REAL"), ("url", "TEXT"))
+    # Response validators, so an expired entry can be revalidated with a conditional request
+    CACHE_COLUMN_MIGRATIONS = (("etag", "TEXT"), ("last_modified", "TEXT"))
+
+    # Every history query is an index range scan, so it stays fast however large the tables grow
+    CREATE_INDEXES = (
+        "CREATE INDEX IF NOT EXISTS idx_results_session ON scan_results (session_id);",
+        "CREATE INDEX IF NOT EXISTS idx_results_site_status ON scan_results (site_name, status, scanned_at);",
+        "CREATE INDEX IF NOT EXISTS idx_results_username ON scan_results (username, site_name, result_id);",
+        "CREATE INDEX IF NOT EXISTS idx_sessions_username ON scan_sessions (username_scanned, session_id);",
+        "CREATE INDEX IF NOT EXISTS idx_results_scanned_at ON scan_results (scanned_at);",
+    )
+
+    INSERT_RESULT = """
+    INSERT INTO scan_results (session_id, site_name, status, full_name, followers, following, posts,
+                              is_private, is_verified, username, scanned_at, url)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+    """
+
+    RESULT_COLUMNS = "result_id, session_id, site_name, username, status, scanned_at, url, full_name, followers, following, posts, is_private, is_verified"
+
+    UPSERT_CACHE = """
+    INSERT OR REPLACE INTO result_cache (platform, username, status, result, cached_at, etag, last_modified)
+    VALUES (?, ?, ?, ?, ?, ?, ?);
+    """
+
+    CREATE_JOBS_TABLE = """
+    CREATE TABLE IF NOT EXISTS scan_jobs (
+        job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        source TEXT NOT NULL,
+        options TEXT NOT NULL,
+        status TEXT NOT NULL,
+        cursor INTEGER NOT NULL DEFAULT 0
+    );
+    """
+
+    # Per-platform completion for usernames at or past a job's cursor. Rows behind
+    # the cursor are pruned at each checkpoint, so the table stays small.
+    CREATE_JOB_PROGRESS_TABLE = """
+    CREATE TABLE IF NOT EXISTS job_progress (
+        job_id INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        platform TEXT NOT NULL,
+        PRIMARY KEY (job_id, position, platform),
+        FOREIGN KEY (job_id) REFERENCES scan_jobs (job_id)
+    ) WITHOUT ROWID;
+    """
+
+    INSERT_JOB_PROGRESS = "INSERT OR IGNORE INTO job_progress (job_id, position, platform) VALUES (?, ?, ?);"
+    UPDATE_JOB_CURSOR = "UPDATE scan_jobs SET cursor = ?, updated_at = ? WHERE job_id = ?;"
+    PRUNE_JOB_PROGRESS = "DELETE FROM job_progress WHERE job_id = ? AND position < ?;"
+
+    CREATE_CACHE_TABLE = """
+    CREATE TABLE IF NOT EXISTS result_cache (
+        platform TEXT NOT NULL,
+        username TEXT NOT NULL,
+        status TEXT NOT NULL,
+        result TEXT NOT NULL,
+        cached_at REAL NOT NULL,
+        PRIMARY KEY (platform, username)
+    );
+    """
+    
+    CREATE_NEGATIVE_FILTER_TABLE = """
+    CREATE TABLE IF NOT EXISTS negative_filters (
+        platform TEXT NOT NULL,
+        slice INTEGER NOT NULL,
+        capacity INTEGER NOT NULL,
+        error_rate REAL NOT NULL,
+        item_count INTEGER NOT NULL,
+        bits BLOB NOT NULL,
+        PRIMARY KEY (platform, slice)
+    );
+    """
+    UPSERT_NEGATIVE_SLICE = """
+    INSERT OR REPLACE INTO negative_filters (platform, slice, capacity, error_rate, item_count, bits)
+    VALUES (?, ?, ?, ?, ?, ?);
+    """
+
+    CREATE_ASSETS_TABLE = """
+    CREATE TABLE IF NOT EXISTS profile_assets (
+        platform TEXT NOT NULL,
+        username TEXT NOT NULL,
+        url TEXT NOT NULL,
+        sha256 TEXT NOT NULL,
+        path TEXT NOT NULL,
+        fetched_at REAL NOT NULL,
+        PRIMARY KEY (platform, username)
+    );
+    """
+    UPSERT_ASSET = """
+    INSERT OR REPLACE INTO profile_assets (platform, username, url, sha256, path, fetched_at)
+    VALUES (?, ?, ?, ?, ?, ?);
+    """
     
     def __init__(self):
         # We don't open the connection here, only when a method is called.
         self._conn = None
+        # Concurrent scans must not race each other into opening several connections
+        self._conn_lock = asyncio.Lock()
+
+        config = ConfigManager()
+        self.write_batch_size = config.get_setting("database.write_batch_size", 1000)
+        self.write_flush_interval = config.get_setting("database.write_flush_interval_seconds", 0.25)
+        self.write_queue_size = config.get_setting("database.write_queue_size", 100000)
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
 
     async def _get_conn(self) -> aiosqlite.Connection:
         """Returns a single, shared connection instance."""
         if not self._conn:
-            self._conn = await aiosqlite.connect(self.DB_NAME)
-            await self._setup_tables()
+            async with self._conn_lock:
+                if not self._conn:
+                    conn = await aiosqlite.connect(self.DB_NAME)
+                    for pragma in self.PRAGMAS:
+                        await conn.execute(pragma)
+                    await self._setup_tables(conn)
+                    self._conn = conn
         return self._conn
 
-    async def _setup_tables(self):
+    async def _setup_tables(self, conn: aiosqlite.Connection):
         """Creates the necessary tables if they do not exist."""
         try:
-            conn = await self._get_conn()
             await conn.execute(self.CREATE_SESSIONS_TABLE)
             await conn.execute(self.CREATE_RESULTS_TABLE)
+            await conn.execute(self.CREATE_CACHE_TABLE)
+            await conn.execute(self.CREATE_JOBS_TABLE)
+            await conn.execute(self.CREATE_JOB_PROGRESS_TABLE)
+            await conn.execute(self.CREATE_NEGATIVE_FILTER_TABLE)
+            await conn.execute(self.CREATE_ASSETS_TABLE)
+            cursor = await conn.execute("PRAGMA table_info(scan_results);")
+            columns = {row[1] for row in await cursor.fetchall()}
+            for column, column_type in self.RESULT_COLUMN_MIGRATIONS:
+                if column not in columns:
+                    await conn.execute(f"ALTER TABLE scan_results ADD COLUMN {column} {column_type};")
+            cursor = await conn.execute("PRAGMA table_info(result_cache);")
+            columns = {row[1] for row in await cursor.fetchall()}
+            for column, column_type in self.CACHE_COLUMN_MIGRATIONS:
+                if column not in columns:
+                    await conn.execute(f"ALTER TABLE result_cache ADD COLUMN {column} {column_type};")
+            for index in self.CREATE_INDEXES:
+                await conn.execute(index)
             await conn.commit()
             logger.info("Database tables verified/created successfully.")
         except aiosqlite.Error as e:
             logger.error(f"Failed to create database tables: {e}")
 
-    async def save_session(self, username: str, results_count: int, duration: float) -> Optional[int]:
-        """Saves a new scan session to the database and returns its ID."""
+    def _ensure_writer(self):
+        """Starts the background writer on first use."""
+        if self._writer_task is None:
+            self._write_queue = asyncio.Queue(maxsize=self.write_queue_size)
+            self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def _enqueue(self, query: str, params: tuple):
+        """Hands a write to the background writer. Only waits if the queue is full."""
+        self._ensure_writer()
+        await self._write_queue.put((query, params))
+
+    async def _writer_loop(self):
+        """
+        Drains the write queue in batches. A batch is committed once it holds
+        write_batch_size rows or write_flush_interval seconds have passed since
+        its first row, whichever comes first.
+        """
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._write_queue.get()
+            if item is self._STOP:
+                self._write_queue.task_done()
+                break
+            WRITE_QUEUE_DEPTH.set(self._write_queue.qsize() + 1)
+            batch = [item]
+            deadline = loop.time() + self.write_flush_interval
+            while len(batch) < self.write_batch_size:
+                try:
+                    item = self._write_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._write_queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if item is self._STOP:
+                    stopping = True
+                    self._write_queue.task_done()
+                    break
+                batch.append(item)
+
+            await self._write_batch(batch)
+            for _ in batch:
+                self._write_queue.task_done()
+
+    async def _write_batch(self, batch: List[Tuple[str, tuple]]):
+        """Writes a batch in one transaction, one executemany per statement."""
+        started = time.monotonic()
+        try:
+            conn = await self._get_conn()
+            for query, group in itertools.groupby(batch, key=lambda item: item[0]):
+                await conn.executemany(query, [params for _, params in group])
+            await conn.commit()
+            FLUSH_LATENCY.observe(time.monotonic() - started)
+            ROWS_WRITTEN.inc(len(batch))
+            logger.debug(f"Flushed {len(batch)} queued writes.")
+        except aiosqlite.Error as e:
+            logger.error(f"Error flushing {len(batch)} queued writes: {e}")
+            if self._conn:
+                await self._conn.rollback()
+
+    async def flush(self):
+        """Waits until every queued write has been committed."""
+        if self._writer_task is not None:
+            await self._write_queue.join()
+
+    async def save_session(self, username: str, results_count: int, duration: float,
+                           results: Optional[Iterable[Tuple[str, Dict[str, Any]]]] = None) -> Optional[int]:
+        """
+        Saves a new scan session to the database and returns its ID. `results`, the
+        session's (platform key, result) pairs, are queued for the writer linked to it.
+        """
         try:
             conn = await self._get_conn()
             timestamp = datetime.datetime.now().isoformat()
@@ -71,16 +309,22 @@ class DatabaseManager:
             cursor = await conn.execute(query, (timestamp, username, results_count, duration))
             await conn.commit()
             logger.info(f"Scan session saved for {username}.")
-            return cursor.lastrowid
+            session_id = cursor.lastrowid
         except aiosqlite.Error as e:
             logger.error(f"Error saving scan session for {username}: {e}")
             return None
+        scanned_at = time.time()
+        for site_name, result in results or ():
+            await self.save_result(
+                session_id, site_name, result.get("status", "ERROR"), result.get("details"),
+                username=username, scanned_at=scanned_at, url=result.get("url")
+            )
+        return session_id
 
-    async def save_result(self, session_id: int, site_name: str, status: str, details: Optional[Dict] = None):
-        """Saves a single scan result linked to a session."""
+    async def save_result(self, session_id: int, site_name: str, status: str, details: Optional[Dict] = None,
+                          username: Optional[str] = None, scanned_at: Optional[float] = None, url: Optional[str] = None):
+        """Queues a single scan result linked to a session for the background writer."""
         try:
-            conn = await self._get_conn()
-            
             # Prepare data for insertion
             full_name = details.get('full_name') if details else None
             followers = details.get('followers') if details else None
@@ -89,30 +333,293 @@ class DatabaseManager:
             is_private = details.get('is_private') if details else None
             is_verified = details.get('is_verified') if details else None
 
+            await self._enqueue(
+                self.INSERT_RESULT,
+                (session_id, site_name, status, full_name, followers, following, posts, is_private, is_verified,
+                 username, scanned_at if scanned_at is not None else time.time(), url)
+            )
+            logger.debug(f"Scan result queued for {site_name}.")
+        except aiosqlite.Error as e:
+            logger.error(f"Error saving scan result for {site_name}: {e}")
+
+    async def get_cached_result(self, platform: str, username: str) -> Optional[Tuple[str, float, Optional[str], Optional[str]]]:
+        """Returns the cached (result_json, cached_at, etag, last_modified) row for a platform/username, if any."""
+        try:
+            conn = await self._get_conn()
+            query = "SELECT result, cached_at, etag, last_modified FROM result_cache WHERE platform = ? AND username = ?;"
+            cursor = await conn.execute(query, (platform, username))
+            return await cursor.fetchone()
+        except aiosqlite.Error as e:
+            logger.error(f"Error reading cached result for {platform}/{username}: {e}")
+            return None
+
+    async def save_cached_result(self, platform: str, username: str, status: str, result: str, cached_at: float,
+                                 etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Queues a store or refresh of the cached result for a platform/username."""
+        try:
+            await self._enqueue(self.UPSERT_CACHE, (platform, username, status, result, cached_at, etag, last_modified))
+        except aiosqlite.Error as e:
+            logger.error(f"Error caching result for {platform}/{username}: {e}")
+
+    async def get_negative_slices(self, oldest_slice: int) -> List[Tuple[str, int, int, float, int, bytes]]:
+        """Returns every stored negative-filter slice at or after `oldest_slice`."""
+        try:
+            conn = await self._get_conn()
             query = """
-            INSERT INTO scan_results (session_id, site_name, status, full_name, followers, following, posts, is_private, is_verified)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
+            SELECT platform, slice, capacity, error_rate, item_count, bits
+            FROM negative_filters WHERE slice >= ?;
             """
-            await conn.execute(query, (session_id, site_name, status, full_name, followers, following, posts, is_private, is_verified))
+            cursor = await conn.execute(query, (oldest_slice,))
+            return await cursor.fetchall()
+        except aiosqlite.Error as e:
+            logger.error(f"Error loading negative filters: {e}")
+            return []
+
+    async def save_negative_slices(self, slices: List[Tuple[str, int, int, float, int, bytes]], oldest_slice: int):
+        """Stores negative-filter slices and drops the ones that have expired, in one transaction."""
+        try:
+            conn = await self._get_conn()
+            await conn.executemany(self.UPSERT_NEGATIVE_SLICE, slices)
+            await conn.execute("DELETE FROM negative_filters WHERE slice < ?;", (oldest_slice,))
             await conn.commit()
-            logger.info(f"Scan result saved for {site_name}.")
         except aiosqlite.Error as e:
-            logger.error(f"Error saving scan result for {site_name}: {e}")
+            logger.error(f"Error saving negative filters: {e}")
+
+    async def save_asset(self, platform: str, username: str, url: str, sha256: str, path: str, fetched_at: float):
+        """Queues a record of the profile picture stored for a platform/username."""
+        try:
+            await self._enqueue(self.UPSERT_ASSET, (platform, username, url, sha256, path, fetched_at))
+        except aiosqlite.Error as e:
+            logger.error(f"Error recording the avatar of {platform}/{username}: {e}")
+
+    async def create_job(self, source: str, options: str) -> Optional[int]:
+        """Registers a new batch scan job and returns its ID."""
+        try:
+            conn = await self._get_conn()
+            timestamp = datetime.datetime.now().isoformat()
+            query = """
+            INSERT INTO scan_jobs (created_at, updated_at, source, options, status, cursor)
+            VALUES (?, ?, ?, ?, 'RUNNING', 0);
+            """
+            cursor = await conn.execute(query, (timestamp, timestamp, source, options))
+            await conn.commit()
+            logger.info(f"Scan job {cursor.lastrowid} created for {source}.")
+            return cursor.lastrowid
+        except aiosqlite.Error as e:
+            logger.error(f"Error creating scan job for {source}: {e}")
+            return None
+
+    async def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Returns a job's stored state, or None if it does not exist."""
+        try:
+            conn = await self._get_conn()
+            query = "SELECT job_id, created_at, updated_at, source, options, status, cursor FROM scan_jobs WHERE job_id = ?;"
+            cursor = await conn.execute(query, (job_id,))
+            row = await cursor.fetchone()
+            if row is None:
+                return None
+            return dict(zip([column[0] for column in cursor.description], row))
+        except aiosqlite.Error as e:
+            logger.error(f"Error loading scan job {job_id}: {e}")
+            return None
 
-    async def get_all_sessions(self) -> List[Dict[str, Any]]:
-        """Retrieves a list of all past scan sessions."""
+    async def get_job_progress(self, job_id: int, from_position: int) -> List[Tuple[int, str]]:
+        """Returns the (position, platform) pairs a job completed at or past a position."""
         try:
             conn = await self._get_conn()
-            query = "SELECT * FROM scan_sessions ORDER BY timestamp DESC;"
-            cursor = await conn.execute(query)
-            sessions = await cursor.fetchall()
-            return [dict(row) for row in sessions]
+            query = "SELECT position, platform FROM job_progress WHERE job_id = ? AND position >= ?;"
+            cursor = await conn.execute(query, (job_id, from_position))
+            return await cursor.fetchall()
+        except aiosqlite.Error as e:
+            logger.error(f"Error loading progress for scan job {job_id}: {e}")
+            return []
+
+    async def save_job_progress(self, job_id: int, position: int, platform: str):
+        """Queues a record that a job finished one (username, platform) pair."""
+        await self._enqueue(self.INSERT_JOB_PROGRESS, (job_id, position, platform))
+
+    async def checkpoint_job(self, job_id: int, cursor: int):
+        """Queues an advance of a job's input cursor and prunes progress rows behind it."""
+        await self._enqueue(self.UPDATE_JOB_CURSOR, (cursor, datetime.datetime.now().isoformat(), job_id))
+        await self._enqueue(self.PRUNE_JOB_PROGRESS, (job_id, cursor))
+
+    async def set_job_status(self, job_id: int, status: str):
+        """Updates a job's status once all of its queued progress is on disk."""
+        try:
+            await self.flush()
+            conn = await self._get_conn()
+            query = "UPDATE scan_jobs SET status = ?, updated_at = ? WHERE job_id = ?;"
+            await conn.execute(query, (status, datetime.datetime.now().isoformat(), job_id))
+            await conn.commit()
+        except aiosqlite.Error as e:
+            logger.error(f"Error updating status of scan job {job_id}: {e}")
+
+    async def _fetch(self, query: str, params: tuple) -> List[Dict[str, Any]]:
+        """Runs a read query and returns its rows as dicts keyed by column name."""
+        conn = await self._get_conn()
+        cursor = await conn.execute(query, params)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in await cursor.fetchall()]
+
+    async def get_sessions_page(self, username: Optional[str] = None, before: Optional[int] = None,
+                                limit: int = 500) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Returns one page of sessions, newest first, and the cursor for the next page
+        (None after the last). Pages are keyed on session_id rather than OFFSET, so
+        each one costs the same however deep into the history it is.
+        """
+        clauses, params = [], []
+        if username is not None:
+            clauses.append("username_scanned = ?")
+            params.append(username)
+        if before is not None:
+            clauses.append("session_id < ?")
+            params.append(before)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"SELECT * FROM scan_sessions {where} ORDER BY session_id DESC LIMIT ?;"
+        try:
+            rows = await self._fetch(query, (*params, limit))
         except aiosqlite.Error as e:
             logger.error(f"Error retrieving sessions: {e}")
+            return [], None
+        return rows, (rows[-1]["session_id"] if len(rows) == limit else None)
+
+    async def iter_sessions(self, username: Optional[str] = None, page_size: int = 500) -> AsyncIterator[Dict[str, Any]]:
+        """Yields sessions newest first, one page at a time."""
+        cursor = None
+        while True:
+            rows, cursor = await self.get_sessions_page(username, before=cursor, limit=page_size)
+            for row in rows:
+                yield row
+            if cursor is None:
+                return
+
+    async def get_all_sessions(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Retrieves past scan sessions, newest first (at most `limit` of them)."""
+        sessions = []
+        async for session in self.iter_sessions(page_size=min(limit or 500, 500)):
+            sessions.append(session)
+            if limit is not None and len(sessions) >= limit:
+                break
+        return sessions
+
+    async def get_session_results(self, session_id: int) -> List[Dict[str, Any]]:
+        """Returns every result saved for a session."""
+        try:
+            query = f"SELECT {self.RESULT_COLUMNS} FROM scan_results WHERE session_id = ? ORDER BY result_id;"
+            return await self._fetch(query, (session_id,))
+        except aiosqlite.Error as e:
+            logger.error(f"Error retrieving results of session {session_id}: {e}")
             return []
 
+    async def get_latest_statuses(self, username: str) -> Dict[str, Dict[str, Any]]:
+        """Returns the most recent result for a username on every platform it was scanned on."""
+        query = f"""
+        SELECT {self.RESULT_COLUMNS} FROM scan_results WHERE result_id IN (
+            SELECT MAX(result_id) FROM scan_results WHERE username = ? GROUP BY site_name
+        ) ORDER BY site_name;
+        """
+        try:
+            return {row["site_name"]: row for row in await self._fetch(query, (username,))}
+        except aiosqlite.Error as e:
+            logger.error(f"Error retrieving the latest statuses of {username}: {e}")
+            return {}
+
+    async def get_results_page(self, site_name: str, status: str = "FOUND", since: float = 0.0,
+                               after: Optional[Tuple[float, int]] = None,
+                               limit: int = 500) -> Tuple[List[Dict[str, Any]], Optional[Tuple[float, int]]]:
+        """
+        Returns one page of a platform's results with a status, scanned at or after
+        `since`, oldest first, and the (scanned_at, result_id) cursor for the next page.
+        """
+        if after is None:
+            after = (since, 0)
+        query = f"""
+        SELECT {self.RESULT_COLUMNS} FROM scan_results
+        WHERE site_name = ? AND status = ? AND (scanned_at, result_id) > (?, ?)
+        ORDER BY scanned_at, result_id LIMIT ?;
+        """
+        try:
+            rows = await self._fetch(query, (site_name, status, after[0], after[1], limit))
+        except aiosqlite.Error as e:
+            logger.error(f"Error retrieving {status} results on {site_name}: {e}")
+            return [], None
+        cursor = (rows[-1]["scanned_at"], rows[-1]["result_id"]) if len(rows) == limit else None
+        return rows, cursor
+
+    async def iter_results(self, site_name: str, status: str = "FOUND", since: float = 0.0,
+                           page_size: int = 500) -> AsyncIterator[Dict[str, Any]]:
+        """Yields a platform's results with a status since a time, one page at a time."""
+        cursor = None
+        while True:
+            rows, cursor = await self.get_results_page(site_name, status, since, after=cursor, limit=page_size)
+            for row in rows:
+                yield row
+            if cursor is None:
+                return
+
+    EXPORT_COLUMNS = (
+        "result_id", "session_id", "session_timestamp", "username", "platform", "status", "scanned_at", "url",
+        "full_name", "followers", "following", "posts", "is_private", "is_verified"
+    )
+
+    async def iter_export_chunks(self, since: Optional[float] = None, until: Optional[float] = None,
+                                 platforms: Optional[List[str]] = None, statuses: Optional[List[str]] = None,
+                                 chunk_size: int = 10000) -> AsyncIterator[List[tuple]]:
+        """
+        Yields every result joined with its session, in EXPORT_COLUMNS order, as chunks
+        of at most `chunk_size` tuples. Chunks are keyed on result_id, so each is one
+        primary-key range read and memory stays flat for any history size. With `since`,
+        reading starts at the first matching result, so an incremental export only
+        touches the rows it returns.
+        """
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("r.scanned_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("r.scanned_at < ?")
+            params.append(until)
+        if platforms:
+            clauses.append(f"r.site_name IN ({', '.join('?' * len(platforms))})")
+            params.extend(platforms)
+        if statuses:
+            clauses.append(f"r.status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        filters = "".join(f" AND {clause}" for clause in clauses)
+        query = f"""
+        SELECT r.result_id, r.session_id, s.timestamp, COALESCE(r.username, s.username_scanned), r.site_name,
+               r.status, r.scanned_at, r.url, r.full_name, r.followers, r.following, r.posts, r.is_private, r.is_verified
+        FROM scan_results r LEFT JOIN scan_sessions s ON s.session_id = r.session_id
+        WHERE r.result_id > ?{filters}
+        ORDER BY r.result_id LIMIT ?;
+        """
+        await self.flush()
+        conn = await self._get_conn()
+        last_id = 0
+        if since is not None:
+            cursor = await conn.execute("SELECT MIN(result_id) FROM scan_results WHERE scanned_at >= ?;", (since,))
+            first_id = (await cursor.fetchone())[0]
+            if first_id is None:
+                return
+            last_id = first_id - 1
+        while True:
+            cursor = await conn.execute(query, (last_id, *params, chunk_size))
+            rows = await cursor.fetchall()
+            if not rows:
+                return
+            yield rows
+            if len(rows) < chunk_size:
+                return
+            last_id = rows[-1][0]
+
     async def close(self):
-        """Closes the database connection if it's open."""
+        """Flushes any queued writes, then closes the database connection if it's open."""
+        if self._writer_task is not None:
+            await self._write_queue.put(self._STOP)
+            await self._writer_task
+            self._writer_task = None
+            self._write_queue = None
         if self._conn:
             await self._conn.close()
             self._conn = None
@@ -0,0 +1,121 @@
+import asyncio
+import time
+import logging
+from typing import Dict, Optional, Set, Tuple
+
+from src.config import ConfigManager
+from src.metrics import MetricsRegistry
+from src.utils.bloom import BloomFilter
+from .database_manager import DatabaseManager
+
+# Set up logging for the negative-result filter
+logger = logging.getLogger(__name__)
+
+NEGATIVE_SKIPS = MetricsRegistry().counter(
+    "pro_scanner_negative_filter_skips_total", "Checks skipped because the account was recently confirmed absent.", ("platform",)
+)
+
+class NegativeFilter:
+    """
+    A compact, persistent record of accounts recently confirmed NOT_FOUND, so sweeps of
+    generated username variants skip known-absent candidates before any request.
+
+    Each platform keeps one Bloom filter per time slice (`slice_hours` long). New
+    negatives go into the current slice and lookups consult every live slice; once a
+    slice is `slices` slices old it is dropped as a whole, which expires its entries
+    without tracking them one by one. A Bloom filter can err only towards "seen", so
+    at the configured error rate an existing account may rarely be skipped; it never
+    makes a recorded negative look new.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, enabled: bool = True, slice_hours: float = 24,
+                 slices: int = 7, capacity: int = 100000, error_rate: float = 0.001):
+        self.db_manager = db_manager
+        self.enabled = enabled
+        self.slice_seconds = max(60.0, slice_hours * 3600)
+        self.slices = max(1, slices)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # (platform, slice index) -> filter
+        self._filters: Dict[Tuple[str, int], BloomFilter] = {}
+        self._dirty: Set[Tuple[str, int]] = set()
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    @classmethod
+    def from_config(cls, db_manager: DatabaseManager, config: Optional[ConfigManager] = None) -> 'NegativeFilter':
+        """Builds the filter from the `negative_filter` settings."""
+        config = config or ConfigManager()
+        return cls(
+            db_manager,
+            enabled=bool(config.get_setting("negative_filter.enabled", True)),
+            slice_hours=config.get_setting("negative_filter.slice_hours", 24),
+            slices=config.get_setting("negative_filter.slices", 7),
+            capacity=config.get_setting("negative_filter.slice_capacity", 100000),
+            error_rate=config.get_setting("negative_filter.error_rate", 0.001)
+        )
+
+    def _current_slice(self) -> int:
+        return int(time.time() // self.slice_seconds)
+
+    def _oldest_live_slice(self) -> int:
+        return self._current_slice() - self.slices + 1
+
+    async def _ensure_loaded(self):
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            for platform, index, capacity, error_rate, count, bits in await self.db_manager.get_negative_slices(self._oldest_live_slice()):
+                try:
+                    self._filters[(platform, index)] = BloomFilter.from_bytes(capacity, error_rate, bits, count)
+                except ValueError as e:
+                    logger.warning(f"Discarding unreadable negative filter for {platform}: {e}")
+            self._loaded = True
+            if self._filters:
+                logger.info(f"Loaded {len(self._filters)} negative filter slice(s).")
+
+    async def known_absent(self, platform: str, key: str) -> bool:
+        """Returns True if the account was confirmed absent within the expiry window."""
+        if not self.enabled:
+            return False
+        await self._ensure_loaded()
+        oldest = self._oldest_live_slice()
+        for (name, index), bloom in self._filters.items():
+            if name == platform and index >= oldest and key in bloom:
+                NEGATIVE_SKIPS.labels(platform).inc()
+                return True
+        return False
+
+    async def add(self, platform: str, key: str):
+        """Records a confirmed NOT_FOUND in the platform's current slice."""
+        if not self.enabled:
+            return
+        await self._ensure_loaded()
+        slot = (platform, self._current_slice())
+        bloom = self._filters.get(slot)
+        if bloom is None:
+            bloom = self._filters[slot] = BloomFilter(self.capacity, self.error_rate)
+        if not bloom.add(key):
+            self._dirty.add(slot)
+            if bloom.count == self.capacity:
+                logger.warning(
+                    f"Negative filter for {platform} reached its slice capacity ({self.capacity}); "
+                    f"raise negative_filter.slice_capacity to keep the error rate at {self.error_rate}"
+                )
+
+    async def save(self):
+        """Writes the slices changed since the last save and forgets expired ones."""
+        if not self._dirty:
+            return
+        oldest = self._oldest_live_slice()
+        for slot in [slot for slot in self._filters if slot[1] < oldest]:
+            del self._filters[slot]
+        slices = [
+            (platform, index, bloom.capacity, bloom.error_rate, bloom.count, bytes(bloom.bits))
+            for (platform, index), bloom in self._filters.items() if (platform, index) in self._dirty
+        ]
+        self._dirty.clear()
+        await self.db_manager.save_negative_slices(slices, oldest)
+        logger.info(f"Saved {len(slices)} negative filter slice(s).")
@@ -0,0 +1,130 @@
+import json
+import time
+import logging
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple, Set
+
+from src.config import ConfigManager
+from src.utils.input_stream import username_key
+from .database_manager import DatabaseManager
+
+# Set up logging for the result cache
+logger = logging.getLogger(__name__)
+
+class ResultCache:
+    """
+    A two-tier cache of scan results keyed by (platform, normalized username).
+    The first tier is an in-process LRU bounded by entry count; the second is the
+    `result_cache` table in the SQLite database, which survives restarts.
+    Only conclusive results (FOUND / NOT_FOUND) are cached.
+
+    The response validators (ETag, Last-Modified) of a result are kept with it, so
+    an entry past its TTL can still be revalidated with a conditional request
+    instead of downloading the profile again.
+    """
+
+    CACHEABLE_STATUSES = ("FOUND", "NOT_FOUND")
+    TRANSIENT_KEYS = ("validators", "cached", "coalesced", "revalidated")
+
+    def __init__(self, db_manager: DatabaseManager, default_ttl_hours: float = 24,
+                 platform_ttl_hours: Optional[Dict[str, float]] = None, max_entries: int = 10000,
+                 case_sensitive: Optional[Set[str]] = None):
+        self.db_manager = db_manager
+        self.default_ttl = default_ttl_hours * 3600
+        self.platform_ttls = {k: v * 3600 for k, v in (platform_ttl_hours or {}).items()}
+        self.max_entries = max_entries
+        self.case_sensitive = set(case_sensitive or ())
+        self._lru: "OrderedDict[Tuple[str, str], Tuple[Dict[str, Any], float, Optional[Dict[str, str]]]]" = OrderedDict()
+
+    @classmethod
+    def from_config(cls, db_manager: DatabaseManager, config: Optional[ConfigManager] = None) -> 'ResultCache':
+        """
+        Builds the cache from database.cache_ttl_hours and database.cache_max_entries.
+        A platform's own `cache_ttl_hours` in platforms.yml overrides the default TTL,
+        and its `case_sensitive` flag keeps differently cased usernames apart.
+        """
+        config = config or ConfigManager()
+        platforms = config.get_platforms()
+        platform_ttls = {
+            name: platform["cache_ttl_hours"]
+            for name, platform in platforms.items()
+            if platform.get("cache_ttl_hours") is not None
+        }
+        return cls(
+            db_manager,
+            default_ttl_hours=config.get_setting("database.cache_ttl_hours", 24),
+            platform_ttl_hours=platform_ttls,
+            max_entries=config.get_setting("database.cache_max_entries", 10000),
+            case_sensitive={name for name, platform in platforms.items() if platform.get("case_sensitive")}
+        )
+
+    def normalize(self, platform: str, username: str) -> str:
+        """Normalizes a username so trivially different spellings share a cache entry."""
+        return username_key(username, platform in self.case_sensitive)
+
+    def ttl_for(self, platform: str) -> float:
+        """Returns the time-to-live in seconds for a platform's results."""
+        return self.platform_ttls.get(platform, self.default_ttl)
+
+    def _remember(self, key: Tuple[str, str], result: Dict[str, Any], cached_at: float,
+                  validators: Optional[Dict[str, str]] = None):
+        self._lru[key] = (result, cached_at, validators)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    async def _lookup(self, key: Tuple[str, str]) -> Optional[Tuple[Dict[str, Any], float, Optional[Dict[str, str]]]]:
+        """Returns (result, cached_at, validators) from the LRU or the database, whatever its age."""
+        entry = self._lru.get(key)
+        if entry is not None:
+            self._lru.move_to_end(key)
+            return entry
+        row = await self.db_manager.get_cached_result(*key)
+        if row is None:
+            return None
+        payload, cached_at, etag, last_modified = row
+        try:
+            result = json.loads(payload)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Discarding unreadable cache entry for {key}: {e}")
+            return None
+        validators = {k: v for k, v in (("etag", etag), ("last_modified", last_modified)) if v} or None
+        self._remember(key, result, cached_at, validators)
+        return result, cached_at, validators
+
+    async def get(self, platform: str, username: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Returns a fresh cached result, checking the LRU before the database. `max_age`
+        (seconds) replaces the platform's TTL, as the stale-only re-scan mode does.
+        """
+        key = (platform, self.normalize(platform, username))
+        ttl = self.ttl_for(platform) if max_age is None else max_age
+        if ttl <= 0:
+            return None
+        entry = await self._lookup(key)
+        if entry is None or time.time() - entry[1] >= ttl:
+            return None
+        return entry[0]
+
+    async def get_revalidatable(self, platform: str, username: str) -> Optional[Tuple[Dict[str, Any], Dict[str, str]]]:
+        """Returns the cached (result, validators) of an entry of any age that has validators."""
+        entry = await self._lookup((platform, self.normalize(platform, username)))
+        if entry is None or not entry[2]:
+            return None
+        return entry[0], entry[2]
+
+    async def set(self, platform: str, username: str, result: Dict[str, Any]):
+        """Caches a conclusive result, and its response validators if any, in both tiers."""
+        status = result.get("status")
+        if status not in self.CACHEABLE_STATUSES or self.ttl_for(platform) <= 0:
+            return
+        key = (platform, self.normalize(platform, username))
+        validators = result.get("validators")
+        # Flags describing how this particular answer was obtained are not part of the result
+        result = {k: v for k, v in result.items() if k not in self.TRANSIENT_KEYS}
+        cached_at = time.time()
+        self._remember(key, result, cached_at, validators)
+        await self.db_manager.save_cached_result(
+            *key, status, json.dumps(result, default=str), cached_at,
+            (validators or {}).get("etag"), (validators or {}).get("last_modified")
+        )
@@ -1,4 +1,26 @@
 # This file declares the 'detectors' directory as a sub-package.
 # It can be used to import key classes or functions directly into the package namespace.
-from .instagram import InstagramDetector
-# from .twitter import TwitterDetector
+# Re-exports are resolved lazily (PEP 562): the scanner only needs the engine, so the
+# per-platform modules are imported only when something asks for them.
+import importlib
+
+_EXPORTS = {
+    "BaseDetector": ".base",
+    "DeclarativeDetector": ".engine",
+    "PlatformRules": ".engine",
+    "compile_platforms": ".engine",
+    "InstagramDetector": ".instagram",
+    "TwitterDetector": ".twitter",
+    "RedditDetector": ".reddit",
+    "TelegramDetector": ".telegram",
+    "PinterestDetector": ".pinterest",
+    "BskyAppDetector": ".bsky_app",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
@@ -0,0 +1,34 @@
+from typing import Dict, Any, Optional
+
+from src.net.http_client import AsyncHttpClient
+
+class BaseDetector:
+    """
+    Base class for all platform detectors.
+    Detectors never own a client; the shared AsyncHttpClient is injected so every
+    site reuses the same connection pool.
+    """
+    SITE_NAME = "Unknown"
+    BASE_URL = ""
+    TIMEOUT = 10.0
+
+    def __init__(self, http_client: AsyncHttpClient):
+        self.http_client = http_client
+
+    async def scan(self, username: str, validators: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Checks whether the username exists on the platform, conditionally if given previous `validators`."""
+        raise NotImplementedError
+
+    def format_result(self, status: str, details: Optional[Dict] = None, error: Optional[str] = None,
+                      url: Optional[str] = None) -> Dict[str, Any]:
+        """Builds a result dictionary in the shape print_results expects."""
+        result = {
+            "site": self.SITE_NAME,
+            "status": status,
+            "details": details or {}
+        }
+        if url:
+            result["url"] = url
+        if error:
+            result["error"] = error
+        return result
@@ -0,0 +1,322 @@
+import re
+import json
+import functools
+import logging
+import time
+from typing import Dict, Any, Optional, Tuple, Union
+
+import httpx
+
+from src.config import ConfigManager
+from src.net.http_client import AsyncHttpClient
+from src.net.user_agents import UserAgentManager
+from src.metrics import MetricsRegistry
+from src.utils.input_stream import username_key
+from .base import BaseDetector
+
+# Set up logging for the detector engine
+logger = logging.getLogger(__name__)
+
+JsonPath = Tuple[Union[str, int], ...]
+
+REQUEST_LATENCY = MetricsRegistry().histogram(
+    "pro_scanner_request_duration_seconds",
+    "Time from sending a platform request to its verdict, retries and body reading included.", ("platform",)
+)
+RESPONSE_STATUS = MetricsRegistry().counter(
+    "pro_scanner_http_responses_total", "Platform responses by HTTP status code.", ("platform", "code")
+)
+
+def compile_json_path(path: str) -> JsonPath:
+    """Splits a dotted path such as 'data.user.edge_follow.count' into lookup keys."""
+    return tuple(int(part) if part.isdigit() else part for part in path.split("."))
+
+def resolve_json_path(document: Any, path: JsonPath) -> Any:
+    """Follows a compiled path through nested dicts and lists, returning None if it breaks."""
+    for key in path:
+        if isinstance(document, dict):
+            document = document.get(key)
+        elif isinstance(document, list) and isinstance(key, int) and key < len(document):
+            document = document[key]
+        else:
+            return None
+    return document
+
+class MarkerMatcher:
+    """
+    Finds a platform's found / not-found markers in a raw response body.
+    All markers are folded into one case-insensitive regex over bytes, so the body
+    is neither decoded nor scanned more than once, whatever the number of markers.
+    """
+
+    def __init__(self, found_markers: Tuple[str, ...], not_found_markers: Tuple[str, ...]):
+        self.has_found = bool(found_markers)
+        self.has_not_found = bool(not_found_markers)
+        # A marker can straddle two streamed chunks by at most this many bytes
+        self.max_marker_len = max((len(m.encode()) for m in found_markers + not_found_markers), default=0)
+        branches = []
+        if not_found_markers:
+            branches.append(b"(?P<not_found>" + b"|".join(re.escape(m.encode()) for m in not_found_markers) + b")")
+        if found_markers:
+            branches.append(b"(?P<found>" + b"|".join(re.escape(m.encode()) for m in found_markers) + b")")
+        self._pattern = re.compile(b"|".join(branches), re.IGNORECASE) if branches else None
+
+    def scan(self, body: bytes) -> Tuple[bool, bool]:
+        """Returns (found_marker_seen, not_found_marker_seen) in a single pass."""
+        found_seen = False
+        if self._pattern is None:
+            return found_seen, False
+        for match in self._pattern.finditer(body):
+            if match.lastgroup == "not_found":
+                # Not-found markers win, so there is nothing left to look for
+                return found_seen, True
+            found_seen = True
+            if not self.has_not_found:
+                break
+        return found_seen, False
+
+@functools.lru_cache(maxsize=1024)
+def _compile_markers(found_markers: Tuple[str, ...], not_found_markers: Tuple[str, ...]) -> MarkerMatcher:
+    return MarkerMatcher(found_markers, not_found_markers)
+
+class PlatformRules:
+    """
+    The compiled form of one platform entry in platforms.yml. Supported keys:
+      type:              web, api or unavailable
+      url / api_url:     URL template, '{}' is replaced by the username
+      headers:           extra request headers
+      follow_redirects:  defaults to true
+      found_status:      status codes that may mean the profile exists (default [200])
+      not_found_status:  status codes that mean it does not (default [404])
+      found_markers:     body substrings confirming the profile exists ('{}' allowed)
+      not_found_markers: body substrings proving it does not; these take precedence
+      found_path:        JSON path that must be non-empty for the profile to exist
+      details:           mapping of detail name to JSON path
+      method:            GET (default) or HEAD when the status code alone is enough
+      max_bytes:         stop reading an HTML body after this many bytes
+      range_request:     ask for only the first max_bytes with a Range header
+      case_sensitive:    usernames differing only in case are different accounts (default false)
+      conditional:       revalidate cached results with If-None-Match / If-Modified-Since (default true)
+    """
+
+    TYPES = ("web", "api", "unavailable")
+
+    def __init__(self, key: str, config: Dict[str, Any]):
+        self.key = key
+        self.name = config.get("name", key)
+        self.type = config.get("type", "web")
+        if self.type not in self.TYPES:
+            raise ValueError(f"unknown type '{self.type}'")
+        self.description = config.get("description")
+        self.url_template = config.get("api_url") or config.get("url")
+        if self.type != "unavailable" and not self.url_template:
+            raise ValueError("no url or api_url")
+
+        self.headers = dict(config.get("headers") or {})
+        self.follow_redirects = bool(config.get("follow_redirects", True))
+        self.found_status = frozenset(config.get("found_status", [200]))
+        self.not_found_status = frozenset(config.get("not_found_status", [404]))
+
+        self.found_path = compile_json_path(config["found_path"]) if config.get("found_path") else None
+        self.detail_paths = {name: compile_json_path(path) for name, path in (config.get("details") or {}).items()}
+        self.is_json = self.found_path is not None or bool(self.detail_paths)
+
+        self.found_markers = tuple(config.get("found_markers") or ())
+        self.not_found_markers = tuple(config.get("not_found_markers") or ())
+        self._templated = any("{}" in marker for marker in self.found_markers + self.not_found_markers)
+        self._matcher = None if self._templated else MarkerMatcher(self.found_markers, self.not_found_markers)
+        self.needs_body = self.is_json or bool(self.found_markers or self.not_found_markers)
+
+        self.method = str(config.get("method", "GET")).upper()
+        if self.method not in ("GET", "HEAD"):
+            raise ValueError(f"unsupported method '{self.method}'")
+        if self.method == "HEAD" and self.needs_body:
+            raise ValueError("HEAD requests cannot use markers or JSON rules")
+        self.max_bytes = int(config.get("max_bytes") or ConfigManager().get_setting("network.sniff_max_bytes", 262144))
+        self.range_request = bool(config.get("range_request", False))
+        self.conditional = bool(config.get("conditional", True))
+        self.case_sensitive = bool(config.get("case_sensitive", False))
+
+    def account_key(self, username: str) -> str:
+        """Returns the form of a username that identifies one account on this platform."""
+        return username_key(username, self.case_sensitive)
+
+    def url_for(self, username: str) -> str:
+        return self.url_template.format(username) if self.url_template else ""
+
+    def matcher_for(self, username: str) -> MarkerMatcher:
+        """Returns the marker matcher, instantiating username templates when present."""
+        if not self._templated:
+            return self._matcher
+        return _compile_markers(
+            tuple(marker.replace("{}", username) for marker in self.found_markers),
+            tuple(marker.replace("{}", username) for marker in self.not_found_markers)
+        )
+
+    def status_verdict(self, status_code: int) -> Optional[Tuple[str, Dict[str, Any], Optional[str]]]:
+        """Classifies a response from its status code alone, or returns None if the body is needed."""
+        if status_code == 206 and self.range_request:
+            status_code = 200
+        if status_code in self.not_found_status:
+            return "NOT_FOUND", {}, None
+        if status_code not in self.found_status:
+            return "ERROR", {}, f"Unexpected HTTP status {status_code}"
+        if not self.needs_body:
+            return "FOUND", {}, None
+        return None
+
+    def json_verdict(self, body: bytes) -> Tuple[str, Dict[str, Any], Optional[str]]:
+        """Classifies a JSON API body and extracts the configured details."""
+        document = json.loads(body)
+        if self.found_path is not None and not resolve_json_path(document, self.found_path):
+            return "NOT_FOUND", {}, None
+        details = {name: resolve_json_path(document, path) for name, path in self.detail_paths.items()}
+        return "FOUND", details, None
+
+    @staticmethod
+    def marker_verdict(matcher: MarkerMatcher, found_seen: bool, not_found_seen: bool) -> Tuple[str, Dict[str, Any], Optional[str]]:
+        """Classifies an HTML body from the markers seen in it."""
+        if not_found_seen or (matcher.has_found and not found_seen):
+            return "NOT_FOUND", {}, None
+        return "FOUND", {}, None
+
+    def evaluate(self, username: str, status_code: int, body: bytes) -> Tuple[str, Dict[str, Any], Optional[str]]:
+        """Classifies a fully read response. Returns (status, details, error)."""
+        verdict = self.status_verdict(status_code)
+        if verdict is not None:
+            return verdict
+        if self.is_json:
+            return self.json_verdict(body)
+        matcher = self.matcher_for(username)
+        return self.marker_verdict(matcher, *matcher.scan(body))
+
+class SniffStats:
+    """Per-platform counters showing how much of each response body was actually read."""
+
+    def __init__(self):
+        self.responses = 0
+        self.bytes_downloaded = 0
+        self.status_only = 0
+        self.early_exits = 0
+        self.capped = 0
+        self.not_modified = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "responses": self.responses,
+            "bytes_downloaded": self.bytes_downloaded,
+            "avg_bytes": round(self.bytes_downloaded / self.responses) if self.responses else 0,
+            "status_only": self.status_only,
+            "early_exits": self.early_exits,
+            "capped": self.capped,
+            "not_modified": self.not_modified,
+        }
+
+def compile_platforms(platforms: Dict[str, Any]) -> Dict[str, PlatformRules]:
+    """Compiles every enabled platform, skipping (and logging) invalid entries."""
+    compiled = {}
+    for key, config in platforms.items():
+        if not config.get("enabled", True):
+            continue
+        try:
+            compiled[key] = PlatformRules(key, config)
+        except (ValueError, TypeError, KeyError) as e:
+            logger.error(f"❌ Skipping platform '{key}': invalid rules in platforms.yaml ({e})")
+    return compiled
+
+class DeclarativeDetector(BaseDetector):
+    """
+    A detector driven entirely by a platform's compiled rules.
+    Subclasses only need to name their platform key in PLATFORM.
+    """
+    PLATFORM: Optional[str] = None
+
+    def __init__(self, http_client: AsyncHttpClient, rules: Optional[PlatformRules] = None):
+        super().__init__(http_client)
+        if rules is None:
+            rules = PlatformRules(self.PLATFORM, ConfigManager().get_platform_details(self.PLATFORM) or {})
+        self.rules = rules
+        self.SITE_NAME = rules.name
+        self.stats = SniffStats()
+
+    async def scan(self, username: str, validators: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Requests the platform's profile URL and classifies the response, reading
+        as little of the body as the platform's rules allow.
+
+        With the `validators` of a previous response the request is conditional; a
+        304 comes back as status NOT_MODIFIED for the caller to answer from its
+        stored result. The response's own validators are returned under `validators`.
+        """
+        rules = self.rules
+        if rules.type == "unavailable":
+            return self.format_result(status="UNAVAILABLE", error=rules.description)
+
+        url = rules.url_for(username)
+        started = time.monotonic()
+        try:
+            headers = UserAgentManager.get_random_profile()
+            headers.update(rules.headers)
+            if rules.range_request:
+                headers["Range"] = f"bytes=0-{rules.max_bytes - 1}"
+            if validators and rules.conditional:
+                if validators.get("etag"):
+                    headers["If-None-Match"] = validators["etag"]
+                if validators.get("last_modified"):
+                    headers["If-Modified-Since"] = validators["last_modified"]
+            else:
+                validators = None
+            async with self.http_client.stream(
+                rules.method, url, headers=headers, timeout=self.TIMEOUT, follow_redirects=rules.follow_redirects
+            ) as response:
+                RESPONSE_STATUS.labels(rules.key, response.status_code).inc()
+                verdict = rules.status_verdict(response.status_code)
+                if response.status_code == 304 and validators:
+                    self.stats.not_modified += 1
+                    verdict = ("NOT_MODIFIED", {}, None)
+                elif verdict is not None:
+                    self.stats.status_only += 1
+                elif rules.is_json:
+                    verdict = rules.json_verdict(await response.aread())
+                else:
+                    matcher = rules.matcher_for(username)
+                    verdict = rules.marker_verdict(matcher, *await self._sniff(response, matcher))
+                self.stats.responses += 1
+                self.stats.bytes_downloaded += response.num_bytes_downloaded
+                etag, last_modified = response.headers.get("etag"), response.headers.get("last-modified")
+            status, details, error = verdict
+        except httpx.HTTPError as e:
+            return self.format_result(status="ERROR", error=f"HTTP Error: {e}", url=url)
+        except ValueError as e:
+            return self.format_result(status="ERROR", error=f"Unreadable response: {e}", url=url)
+        finally:
+            REQUEST_LATENCY.labels(rules.key).observe(time.monotonic() - started)
+
+        result = self.format_result(status=status, details=details, error=error, url=url)
+        if rules.conditional and (etag or last_modified):
+            result["validators"] = {k: v for k, v in (("etag", etag), ("last_modified", last_modified)) if v}
+        return result
+
+    async def _sniff(self, response: httpx.Response, matcher: MarkerMatcher) -> Tuple[bool, bool]:
+        """
+        Scans a streamed body chunk by chunk, returning (found_seen, not_found_seen).
+        Stops at the first decisive marker or once the platform's byte cap is reached;
+        the unread remainder is never downloaded.
+        """
+        found_seen = False
+        overlap = max(0, matcher.max_marker_len - 1)
+        tail = b""
+        read = 0
+        async for chunk in response.aiter_bytes():
+            window = tail + chunk
+            found, not_found = matcher.scan(window)
+            found_seen = found_seen or found
+            if not_found or (found_seen and not matcher.has_not_found):
+                self.stats.early_exits += 1
+                return found_seen, not_found
+            read += len(chunk)
+            if read >= self.rules.max_bytes:
+                self.stats.capped += 1
+                break
+            tail = window[-overlap:] if overlap else b""
+        return found_seen, False
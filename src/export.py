@@ -0,0 +1,109 @@
+import asyncio
+import csv
+import importlib.util
+import json
+import sys
+import time
+import logging
+from typing import List, Optional, TextIO
+
+from src.db.database_manager import DatabaseManager
+
+# Set up logging for history export
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "ndjson", "parquet")
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+class _TextExporter:
+    def __init__(self, path: str, columns: tuple):
+        self.columns = columns
+        self._file: TextIO = sys.stdout if path == "-" else open(path, "w", encoding="utf-8", newline="")
+
+    def close(self):
+        self._file.flush()
+        if self._file is not sys.stdout:
+            self._file.close()
+
+class CsvExporter(_TextExporter):
+    def __init__(self, path: str, columns: tuple):
+        super().__init__(path, columns)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write_chunk(self, rows: List[tuple]):
+        self._writer.writerows(rows)
+
+class NdjsonExporter(_TextExporter):
+    def write_chunk(self, rows: List[tuple]):
+        columns = self.columns
+        self._file.write("".join(
+            json.dumps(dict(zip(columns, row)), default=str, ensure_ascii=False) + "\n" for row in rows
+        ))
+
+class ParquetExporter:
+    """Writes each chunk as one Parquet row group, so memory is bounded by the chunk size."""
+
+    def __init__(self, path: str, columns: tuple):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if path == "-":
+            raise ValueError("Parquet cannot be written to stdout; give --output FILE")
+        types = {
+            "result_id": pa.int64(), "session_id": pa.int64(), "followers": pa.int64(), "following": pa.int64(),
+            "posts": pa.int64(), "scanned_at": pa.float64(), "is_private": pa.bool_(), "is_verified": pa.bool_()
+        }
+        self._pa = pa
+        self.columns = columns
+        self.schema = pa.schema([(column, types.get(column, pa.string())) for column in columns])
+        self._writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write_chunk(self, rows: List[tuple]):
+        arrays = []
+        for index, field in enumerate(self.schema):
+            values = [row[index] for row in rows]
+            if field.type == self._pa.bool_():
+                # SQLite stores booleans as 0/1
+                values = [None if value is None else bool(value) for value in values]
+            arrays.append(self._pa.array(values, type=field.type))
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self._writer.close()
+
+_EXPORTERS = {"csv": CsvExporter, "ndjson": NdjsonExporter, "parquet": ParquetExporter}
+
+async def export_history(db_manager: DatabaseManager, path: str, fmt: str = "csv", since: Optional[float] = None,
+                         until: Optional[float] = None, platforms: Optional[List[str]] = None,
+                         statuses: Optional[List[str]] = None, chunk_size: int = 10000) -> int:
+    """
+    Streams scan results joined with their sessions to `path` ('-' for stdout) and
+    returns the number of rows written. The next chunk is read from SQLite while the
+    previous one is encoded and written in a worker thread.
+    """
+    if fmt not in _EXPORTERS:
+        raise ValueError(f"Unknown export format '{fmt}' (choose from {', '.join(FORMATS)})")
+    if fmt == "parquet" and not parquet_available():
+        raise ValueError("Parquet export needs the 'pyarrow' package; install it or use --format csv/ndjson")
+
+    started = time.monotonic()
+    exporter = _EXPORTERS[fmt](path, DatabaseManager.EXPORT_COLUMNS)
+    count = 0
+    writing: Optional[asyncio.Future] = None
+    try:
+        async for rows in db_manager.iter_export_chunks(since, until, platforms, statuses, chunk_size):
+            if writing is not None:
+                await writing
+            writing = asyncio.ensure_future(asyncio.to_thread(exporter.write_chunk, rows))
+            count += len(rows)
+        if writing is not None:
+            await writing
+    finally:
+        if writing is not None and not writing.done():
+            await asyncio.gather(writing, return_exceptions=True)
+        exporter.close()
+    logger.info(f"📤 Exported {count} results to {path} as {fmt} in {time.monotonic() - started:.1f}s")
+    return count
@@ -0,0 +1,104 @@
+import json
+import os
+import logging
+from typing import Dict, Any, Optional, Set, Tuple
+
+from src.db.database_manager import DatabaseManager
+
+# Set up logging for scan jobs
+logger = logging.getLogger(__name__)
+
+class ScanJob:
+    """
+    A resumable batch scan persisted in the DatabaseManager SQLite file.
+    It records the job's input and options, the (position, platform) pairs that
+    have completed, and the input cursor: the number of leading usernames that are
+    fully done. Resuming skips everything behind the cursor and every pair already
+    recorded ahead of it, so an interrupted run picks up exactly where it stopped.
+    """
+
+    # Checkpoint the cursor after this many usernames have been completed
+    CHECKPOINT_EVERY = 100
+
+    def __init__(self, db_manager: DatabaseManager, job_id: int, source: str, options: Dict[str, Any],
+                 cursor: int = 0, done: Optional[Set[Tuple[int, str]]] = None, status: str = "RUNNING"):
+        self.db_manager = db_manager
+        self.job_id = job_id
+        self.source = source
+        self.options = options
+        self.status = status
+        self.cursor = cursor
+        self._done = done or set()
+        self._finished: Set[int] = set()
+        self._checkpointed = cursor
+
+    @staticmethod
+    def _fingerprint(source: str) -> Optional[Dict[str, float]]:
+        """Identifies the input file's contents well enough to notice it changing."""
+        if source == "-" or not os.path.isfile(source):
+            return None
+        stat = os.stat(source)
+        return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+    @classmethod
+    async def create(cls, db_manager: DatabaseManager, source: str, options: Dict[str, Any]) -> Optional['ScanJob']:
+        """Registers a new job for an input source."""
+        options = dict(options, input_fingerprint=cls._fingerprint(source))
+        job_id = await db_manager.create_job(source, json.dumps(options))
+        if job_id is None:
+            return None
+        return cls(db_manager, job_id, source, options)
+
+    @classmethod
+    async def load(cls, db_manager: DatabaseManager, job_id: int) -> Optional['ScanJob']:
+        """Restores a job and its recorded progress for resuming."""
+        row = await db_manager.get_job(job_id)
+        if row is None:
+            return None
+        options = json.loads(row["options"])
+        if options.get("input_fingerprint") != cls._fingerprint(row["source"]):
+            logger.warning(f"Input {row['source']} changed since job {job_id} started; resumed results may be off.")
+        done = {tuple(pair) for pair in await db_manager.get_job_progress(job_id, row["cursor"])}
+        return cls(db_manager, job_id, row["source"], options, cursor=row["cursor"], done=done, status=row["status"])
+
+    @property
+    def resumable(self) -> bool:
+        """Only file inputs can be replayed; stdin is gone once read."""
+        return self.source != "-"
+
+    def is_done(self, position: int, platform: str) -> bool:
+        """Whether a (username, platform) pair was completed by an earlier run."""
+        return position < self.cursor or (position, platform) in self._done
+
+    async def record(self, position: int, platform: str):
+        """Records that a (username, platform) pair has completed."""
+        await self.db_manager.save_job_progress(self.job_id, position, platform)
+
+    async def complete(self, position: int):
+        """Marks a username fully done and advances the cursor past any contiguous run."""
+        if position < self.cursor:
+            return
+        self._finished.add(position)
+        while self.cursor in self._finished:
+            self._finished.remove(self.cursor)
+            self.cursor += 1
+        if self.cursor - self._checkpointed >= self.CHECKPOINT_EVERY:
+            await self.checkpoint()
+
+    async def checkpoint(self):
+        """Persists the current cursor."""
+        if self.cursor != self._checkpointed:
+            await self.db_manager.checkpoint_job(self.job_id, self.cursor)
+            self._checkpointed = self.cursor
+
+    async def resume(self):
+        """Marks a loaded job as running again."""
+        self.status = "RUNNING"
+        await self.db_manager.set_job_status(self.job_id, self.status)
+
+    async def finish(self, status: str):
+        """Checkpoints and stores the job's final status (COMPLETED or INTERRUPTED)."""
+        await self.checkpoint()
+        self.status = status
+        await self.db_manager.set_job_status(self.job_id, status)
+        logger.info(f"Scan job {self.job_id} {status.lower()} at input position {self.cursor}.")
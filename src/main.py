@@ -1,88 +1,221 @@
+import argparse
 import asyncio
 import logging
 from src.core import ProScannerCore
+from src.jobs import ScanJob
 from src.utils.cli_utils import (
     print_banner,
     print_results,
+    print_result_line,
+    print_breaker_summary,
     setup_logging,
-    Colors
+    Colors,
+    console
 )
+from src.utils.output import NdjsonWriter
+from src.utils.input_stream import UsernameStream
+from typing import Optional
 import json
+import os
 
-async def interactive_menu():
+async def stream_scan(scanner: ProScannerCore, usernames, args: argparse.Namespace, job: Optional[ScanJob] = None):
+    """
+    Prints each (username, site) result as soon as it completes and, with --output,
+    appends it to an NDJSON file.
+    """
+    writer = NdjsonWriter(args.output) if args.output else None
+    total = len(usernames) if hasattr(usernames, "__len__") else None
+    try:
+        async for result in scanner.scan_stream(usernames, total=total, job=job):
+            print_result_line(result)
+            if writer:
+                writer.write(result)
+    finally:
+        if writer:
+            writer.close()
+    if writer:
+        console.print(f"[{Colors.GREEN}]✅ Results streamed to {args.output}[/]")
+
+async def scan_file(scanner: ProScannerCore, source: str, args: argparse.Namespace,
+                    job: Optional[ScanJob] = None) -> Optional[list]:
+    """
+    Scans every username in a file, or stdin when the source is '-'.
+    The file is read lazily, so the first results arrive before it has been fully read.
+    File scans run as a resumable job; pass `job` to continue an earlier one.
+    Returns the per-username results, or None when they were streamed.
+    """
+    usernames = UsernameStream(source)
+    if job is None and source != "-":
+        options = {"stream": args.stream, "output": args.output, "no_cache": args.no_cache}
+        job = await ScanJob.create(scanner.db_manager, source, options)
+    console.print(f"🕵️‍♂️ Starting scan for usernames from {source}...")
+    if job:
+        console.print(f"[{Colors.GRAY}]Scan job #{job.job_id}. If interrupted, resume with: pro_scanner resume {job.job_id}[/]")
+
+    all_results = None
+    try:
+        if args.stream or args.output:
+            await stream_scan(scanner, usernames, args, job)
+        else:
+            all_results = await scanner.scan_many(usernames, job=job)
+    except (asyncio.CancelledError, KeyboardInterrupt):
+        if job:
+            await job.finish("INTERRUPTED")
+            console.print(f"\n[{Colors.YELLOW}]⏸️ Scan job #{job.job_id} interrupted. Resume with: pro_scanner resume {job.job_id}[/]")
+        raise
+    if job:
+        await job.finish("COMPLETED")
+
+    if usernames.count == 0:
+        console.print(f"[{Colors.RED}]❌ The file is empty.[/]")
+        return None
+    if all_results is not None:
+        print_results(all_results)
+    print_breaker_summary(scanner.breaker_summary())
+    return all_results
+
+async def resume_job(args: argparse.Namespace):
+    """Continues an interrupted scan job from its last checkpoint."""
+    scanner = ProScannerCore(workers=args.workers)
+    try:
+        job = await ScanJob.load(scanner.db_manager, args.job_id)
+        if job is None:
+            console.print(f"[{Colors.RED}]❌ No scan job #{args.job_id} found.[/]")
+            return
+        if job.status == "COMPLETED":
+            console.print(f"[{Colors.GREEN}]✅ Scan job #{job.job_id} already completed.[/]")
+            return
+
+        # Replay the job with its original options. Results already produced are not
+        # repeated, so the remainder is always streamed rather than tabulated.
+        job_args = argparse.Namespace(
+            stream=True,
+            output=job.options.get("output"),
+            no_cache=job.options.get("no_cache", False)
+        )
+        scanner.use_cache = not job_args.no_cache
+        console.print(f"⏯️ Resuming scan job #{job.job_id} from input position {job.cursor}...")
+        await job.resume()
+        await scan_file(scanner, job.source, job_args, job=job)
+    finally:
+        await scanner.close()
+
+async def interactive_menu(args: argparse.Namespace):
     """
     Displays an interactive menu for the user.
     """
-    scanner = ProScannerCore()
-    
+    scanner = ProScannerCore(use_cache=not args.no_cache, workers=args.workers)
+    try:
+        await _menu_loop(scanner, args)
+    finally:
+        await scanner.close()
+
+async def _menu_loop(scanner: ProScannerCore, args: argparse.Namespace):
+    """Runs the menu until the user exits."""
     while True:
-        print(f"\n{Colors.BOLD}{Colors.GRAD1}Menu:{Colors.RESET}")
-        print(f"{Colors.CYAN}1. Scan a single username{Colors.RESET}")
-        print(f"{Colors.CYAN}2. Scan usernames from a file{Colors.RESET}")
-        print(f"{Colors.CYAN}3. Exit{Colors.RESET}")
+        console.print(f"\n[{Colors.BOLD} {Colors.PURPLE}]Menu:[/]")
+        console.print(f"[{Colors.CYAN}]1. Scan a single username[/]")
+        console.print(f"[{Colors.CYAN}]2. Scan usernames from a file[/]")
+        console.print(f"[{Colors.CYAN}]3. Exit[/]")
         
-        choice = input(f"\n{Colors.PURPLE}Enter your choice (1-3): {Colors.RESET}").strip()
+        choice = console.input(f"\n[{Colors.PURPLE}]Enter your choice (1-3): [/]").strip()
         
         if choice == '1':
-            username = input(f"{Colors.YELLOW}Enter the username to scan: {Colors.RESET}").strip()
+            username = console.input(f"[{Colors.YELLOW}]Enter the username to scan: [/]").strip()
             if username:
                 logging.info(f"Scanning single user: @{username}")
                 results = await scanner.scan_username(username)
                 print_results([results])
             else:
-                print(f"{Colors.RED}❌ No username entered. Please try again.{Colors.RESET}")
+                console.print(f"[{Colors.RED}]❌ No username entered. Please try again.[/]")
                 
         elif choice == '2':
-            file_path = input(f"{Colors.YELLOW}Enter the path to the username file: {Colors.RESET}").strip()
+            file_path = console.input(f"[{Colors.YELLOW}]Enter the path to the username file: [/]").strip()
             if file_path:
                 try:
-                    with open(file_path, 'r') as f:
-                        usernames_to_scan = [line.strip() for line in f if line.strip()]
-                    
-                    if not usernames_to_scan:
-                        print(f"{Colors.RED}❌ The file is empty.{Colors.RESET}")
-                        continue
-                        
-                    print(f"🕵️‍♂️ Starting scan for {len(usernames_to_scan)} username(s)...")
-                    
-                    all_results = []
-                    for user in usernames_to_scan:
-                        logging.info(f"Scanning: @{user}")
-                        result = await scanner.scan_username(user)
-                        all_results.append(result)
+                    if not os.path.isfile(file_path):
+                        raise FileNotFoundError(file_path)
 
-                    print_results(all_results)
+                    all_results = await scan_file(scanner, file_path, args)
+                    if not all_results:
+                        continue
                     
                     # Optional: ask to save results
-                    save_choice = input(f"{Colors.YELLOW}Do you want to save the results to a file? (y/n): {Colors.RESET}").lower().strip()
+                    save_choice = console.input(f"[{Colors.YELLOW}]Do you want to save the results to a file? (y/n): [/]").lower().strip()
                     if save_choice == 'y':
                         output_file = "scan_results.json"
                         with open(output_file, "w") as f:
                             json.dump(all_results, f, indent=4)
-                        print(f"{Colors.GREEN}✅ Results saved to {output_file}{Colors.RESET}")
+                        console.print(f"[{Colors.GREEN}]✅ Results saved to {output_file}[/]")
 
                 except FileNotFoundError:
-                    print(f"{Colors.RED}❌ File not found: {file_path}{Colors.RESET}")
+                    console.print(f"[{Colors.RED}]❌ File not found: {file_path}[/]")
             else:
-                print(f"{Colors.RED}❌ No file path entered. Please try again.{Colors.RESET}")
+                console.print(f"[{Colors.RED}]❌ No file path entered. Please try again.[/]")
                 
         elif choice == '3':
-            print(f"{Colors.INFO}👋 Exiting ProScanner. Goodbye!{Colors.RESET}")
+            console.print(f"[{Colors.INFO}]👋 Exiting ProScanner. Goodbye![/]")
             break
             
         else:
-            print(f"{Colors.RED}❌ Invalid choice. Please select 1, 2, or 3.{Colors.RESET}")
+            console.print(f"[{Colors.RED}]❌ Invalid choice. Please select 1, 2, or 3.[/]")
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parses the command-line options."""
+    parser = argparse.ArgumentParser(prog="pro_scanner", description="OSINT username reconnaissance tool.")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached results and query every platform again."
+    )
+    parser.add_argument(
+        "--input",
+        metavar="FILE",
+        help="Scan the usernames in FILE ('-' for stdin) without the interactive menu."
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print each result as soon as it completes instead of one table at the end."
+    )
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        help="Append results to FILE as newline-delimited JSON while scanning (implies --stream)."
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        help="Shard file scans across N worker processes, each with its own event loop and connection pool."
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    resume = subparsers.add_parser("resume", help="Resume an interrupted file scan from its last checkpoint.")
+    resume.add_argument("job_id", type=int, help="ID of the scan job to resume.")
+    return parser.parse_args(argv)
 
-async def main():
+async def main(args: argparse.Namespace):
     """
     Main entry point for the application.
     """
     setup_logging()
     print_banner()
-    await interactive_menu()
+    if args.command == "resume":
+        await resume_job(args)
+        return
+    if args.input:
+        scanner = ProScannerCore(use_cache=not args.no_cache, workers=args.workers)
+        try:
+            await scan_file(scanner, args.input, args)
+        finally:
+            await scanner.close()
+        return
+    await interactive_menu(args)
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        asyncio.run(main(parse_args()))
     except KeyboardInterrupt:
         logging.info("Scan cancelled by user. Exiting.")
@@ -0,0 +1,293 @@
+import asyncio
+import bisect
+import json
+import os
+import time
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.config import ConfigManager
+
+# Set up logging for the metrics module
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from fast cache-like answers up to the request timeout
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class _Child:
+    """The value of one metric for one combination of label values."""
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def set(self, value: float):
+        self.value = value
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimates a quantile by interpolating inside the bucket it falls in."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if index == len(self.buckets):
+                    return lower
+                return lower + (self.buckets[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+class Metric:
+    """
+    A named family of counters, gauges or histograms, one per combination of label values.
+    Children are created on first use and cached, so `labels(...)` on the hot path is a dict lookup.
+    """
+
+    def __init__(self, kind: str, name: str, description: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.kind = kind
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def labels(self, *values: Any):
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            child = self._children[key] = _HistogramChild(self.buckets) if self.kind == "histogram" else _Child()
+        return child
+
+    # Shortcuts for metrics without labels
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _label_text(self, key: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def prometheus_lines(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(self._children.items()):
+            if self.kind != "histogram":
+                lines.append(f"{self.name}{self._label_text(key)} {child.value:g}")
+                continue
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                le_label = f'le="{le}"'
+                lines.append(f"{self.name}_bucket{self._label_text(key, le_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {child.sum:g}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {child.count}")
+        return lines
+
+    def snapshot(self) -> Dict[str, Any]:
+        samples = []
+        for key, child in sorted(self._children.items()):
+            sample: Dict[str, Any] = {"labels": dict(zip(self.labelnames, key))}
+            if self.kind == "histogram":
+                sample.update(
+                    count=child.count,
+                    sum=round(child.sum, 6),
+                    p50=child.quantile(0.5),
+                    p95=child.quantile(0.95),
+                    p99=child.quantile(0.99)
+                )
+            else:
+                sample["value"] = child.value
+            samples.append(sample)
+        return {"type": self.kind, "help": self.description, "samples": samples}
+
+class MetricsRegistry:
+    """
+    The process-wide registry of metrics (singleton). Modules register their metrics
+    at import time and update them in place; exporters read the registry as a whole.
+    """
+
+    _instance: Optional['MetricsRegistry'] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MetricsRegistry, cls).__new__(cls)
+            cls._instance._metrics = {}
+        return cls._instance
+
+    def _register(self, kind: str, name: str, description: str, labelnames: Tuple[str, ...], **kwargs) -> Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Metric(kind, name, description, tuple(labelnames), **kwargs)
+        elif metric.kind != kind:
+            raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+        return metric
+
+    def counter(self, name: str, description: str, labelnames: Tuple[str, ...] = ()) -> Metric:
+        return self._register("counter", name, description, labelnames)
+
+    def gauge(self, name: str, description: str, labelnames: Tuple[str, ...] = ()) -> Metric:
+        return self._register("gauge", name, description, labelnames)
+
+    def histogram(self, name: str, description: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Metric:
+        return self._register("histogram", name, description, labelnames, buckets=buckets)
+
+    def render_prometheus(self) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.prometheus_lines())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns every metric as a JSON-serializable dict, histograms with estimated quantiles."""
+        return {
+            "timestamp": time.time(),
+            "metrics": {name: metric.snapshot() for name, metric in self._metrics.items()}
+        }
+
+EVENT_LOOP_LAG = MetricsRegistry().histogram(
+    "pro_scanner_event_loop_lag_seconds",
+    "How late the event loop woke a timer, i.e. time the loop was busy with other work.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+def _write_atomically(path: str, text: str):
+    """Replaces a file in one step, so scrapers never read a half-written export."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+class MetricsExporter:
+    """
+    Publishes the registry while a scan runs. Depending on the `metrics` settings it
+    periodically writes a Prometheus text file (for node_exporter's textfile collector)
+    and a JSON snapshot, serves both over HTTP at /metrics and /metrics.json, and
+    samples event-loop lag.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, interval: float = 10.0,
+                 prometheus_file: Optional[str] = None, json_file: Optional[str] = None,
+                 http_port: Optional[int] = None, http_host: str = "127.0.0.1", lag_interval: float = 0.5):
+        self.registry = registry or MetricsRegistry()
+        self.interval = interval
+        self.prometheus_file = prometheus_file
+        self.json_file = json_file
+        self.http_port = http_port
+        self.http_host = http_host
+        self.lag_interval = lag_interval
+        self._tasks: List[asyncio.Task] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @classmethod
+    def from_config(cls, config: Optional[ConfigManager] = None) -> Optional['MetricsExporter']:
+        """Builds an exporter from the `metrics` settings, or returns None when metrics are disabled."""
+        config = config or ConfigManager()
+        if not config.get_setting("metrics.enabled", False):
+            return None
+        return cls(
+            interval=config.get_setting("metrics.interval_seconds", 10.0),
+            prometheus_file=config.get_setting("metrics.prometheus_file", None),
+            json_file=config.get_setting("metrics.json_file", None),
+            http_port=config.get_setting("metrics.http_port", None),
+            http_host=config.get_setting("metrics.http_host", "127.0.0.1")
+        )
+
+    async def start(self):
+        self._tasks.append(asyncio.create_task(self._watch_loop_lag()))
+        if self.prometheus_file or self.json_file:
+            self._tasks.append(asyncio.create_task(self._write_periodically()))
+        if self.http_port:
+            self._server = await asyncio.start_server(self._serve, self.http_host, self.http_port)
+            logger.info(f"📈 Serving metrics on http://{self.http_host}:{self.http_port}/metrics")
+
+    async def stop(self):
+        """Stops exporting and writes the files one last time, so they hold the final totals."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self.write_files()
+
+    def write_files(self):
+        try:
+            if self.prometheus_file:
+                _write_atomically(self.prometheus_file, self.registry.render_prometheus())
+            if self.json_file:
+                _write_atomically(self.json_file, json.dumps(self.registry.snapshot(), default=str))
+        except OSError as e:
+            logger.error(f"Error writing metrics: {e}")
+
+    async def _write_periodically(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.write_files()
+
+    async def _watch_loop_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            EVENT_LOOP_LAG.observe(max(0.0, loop.time() - expected))
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """A minimal HTTP/1.0 responder for scrapers; anything but GET /metrics[.json] is a 404."""
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            path = parts[1] if len(parts) > 1 else ""
+            if path == "/metrics":
+                status, content_type, body = "200 OK", "text/plain; version=0.0.4", self.registry.render_prometheus()
+            elif path == "/metrics.json":
+                status, content_type, body = "200 OK", "application/json", json.dumps(self.registry.snapshot(), default=str)
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", "Not Found\n"
+            payload = body.encode()
+            writer.write(
+                f"HTTP/1.0 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(payload)}\r\n\r\n".encode()
+                + payload
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
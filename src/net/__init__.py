@@ -4,3 +4,7 @@
 from .http_client import AsyncHttpClient
 from .user_agents import UserAgentManager
 from .rate_limiter import RateLimiter # Assuming you've also added this module
+from .retry import RetryPolicy, LatencyTracker
+from .dns_cache import DnsCache
+from .concurrency import ConcurrencyController
+from .circuit_breaker import CircuitBreakers
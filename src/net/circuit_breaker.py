@@ -0,0 +1,161 @@
+import collections
+import time
+import logging
+from typing import Dict, Any, Deque, Optional
+
+from src.config import ConfigManager
+from src.metrics import MetricsRegistry
+
+# Set up logging for the circuit breakers
+logger = logging.getLogger(__name__)
+
+CLOSED = "CLOSED"
+OPEN = "OPEN"
+HALF_OPEN = "HALF_OPEN"
+
+CIRCUIT_STATE = MetricsRegistry().gauge(
+    "pro_scanner_circuit_state", "Circuit breaker state per platform (0 closed, 1 half-open, 2 open).", ("platform",)
+)
+SHORT_CIRCUITS = MetricsRegistry().counter(
+    "pro_scanner_circuit_short_circuits_total", "Checks answered UNAVAILABLE without a request.", ("platform",)
+)
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a platform that keeps failing. Once at least `min_calls`
+    of the last `window` checks have completed and `failure_ratio` of them failed, the
+    breaker opens and checks are refused for `open_seconds`. It then half-opens and lets
+    `probes` checks through: if they succeed it closes, otherwise it opens again for
+    twice as long, up to `max_open_seconds`.
+    """
+
+    def __init__(self, name: str, failure_ratio: float = 0.5, window: int = 20, min_calls: int = 10,
+                 open_seconds: float = 30.0, max_open_seconds: float = 600.0, probes: int = 1):
+        self.name = name
+        self.failure_ratio = failure_ratio
+        self.min_calls = max(1, min_calls)
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max(open_seconds, max_open_seconds)
+        self.probes = max(1, probes)
+        self.state = CLOSED
+        self.trips = 0
+        self.short_circuited = 0
+        self._outcomes: Deque[bool] = collections.deque(maxlen=max(window, self.min_calls))
+        self._cooldown = open_seconds
+        self._reopen_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        CIRCUIT_STATE.labels(name).set(0)
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            logger.info(f"🔌 {self.name}: circuit {self.state} -> {state}")
+        self.state = state
+        CIRCUIT_STATE.labels(self.name).set(_STATE_VALUES[state])
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through."""
+        return max(0.0, self._reopen_at - time.monotonic())
+
+    def allow(self) -> bool:
+        """Returns whether a check may be sent now; a False must be answered without a request."""
+        if self.state == OPEN and time.monotonic() >= self._reopen_at:
+            self._set_state(HALF_OPEN)
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and self._probes_in_flight < self.probes:
+            self._probes_in_flight += 1
+            return True
+        self.short_circuited += 1
+        SHORT_CIRCUITS.labels(self.name).inc()
+        return False
+
+    def record(self, success: Optional[bool]):
+        """Reports how an allowed check went; None means it was abandoned before an answer."""
+        if self.state == HALF_OPEN:
+            self._probes_in_flight -= 1
+            if success is None:
+                return
+            if not success:
+                self._trip(self._cooldown * 2)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.probes:
+                self._outcomes.clear()
+                self._cooldown = self.open_seconds
+                self._set_state(CLOSED)
+            return
+        if success is None or self.state != CLOSED:
+            # Checks sent before the breaker opened carry no news
+            return
+        self._outcomes.append(success)
+        if len(self._outcomes) >= self.min_calls:
+            failures = self._outcomes.count(False)
+            if failures / len(self._outcomes) >= self.failure_ratio:
+                self._trip(self.open_seconds)
+
+    def _trip(self, cooldown: float):
+        self._cooldown = min(self.max_open_seconds, cooldown)
+        self._reopen_at = time.monotonic() + self._cooldown
+        self.trips += 1
+        self._outcomes.clear()
+        self._set_state(OPEN)
+        logger.warning(f"⛔ {self.name} keeps failing; skipping it for {self._cooldown:g}s")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"state": self.state, "trips": self.trips, "short_circuited": self.short_circuited}
+
+class CircuitBreakers:
+    """One CircuitBreaker per platform, configured from scanner.circuit_breaker in settings.yml."""
+
+    def __init__(self, enabled: bool = True, **settings):
+        self.enabled = enabled
+        self.settings = settings
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        # Summaries reported by worker processes, whose breakers run there
+        self._reported: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_config(cls, config: Optional[ConfigManager] = None) -> 'CircuitBreakers':
+        config = config or ConfigManager()
+        return cls(
+            enabled=bool(config.get_setting("scanner.circuit_breaker.enabled", True)),
+            failure_ratio=config.get_setting("scanner.circuit_breaker.failure_ratio", 0.5),
+            window=config.get_setting("scanner.circuit_breaker.window", 20),
+            min_calls=config.get_setting("scanner.circuit_breaker.min_calls", 10),
+            open_seconds=config.get_setting("scanner.circuit_breaker.open_seconds", 30.0),
+            max_open_seconds=config.get_setting("scanner.circuit_breaker.max_open_seconds", 600.0),
+            probes=config.get_setting("scanner.circuit_breaker.half_open_probes", 1)
+        )
+
+    def get(self, platform: str) -> Optional[CircuitBreaker]:
+        """Returns the platform's breaker, or None when breakers are disabled."""
+        if not self.enabled:
+            return None
+        breaker = self.breakers.get(platform)
+        if breaker is None:
+            breaker = self.breakers[platform] = CircuitBreaker(platform, **self.settings)
+        return breaker
+
+    def absorb(self, summary: Dict[str, Dict[str, Any]]):
+        """Merges another process's summary: counts add up and the worst state wins."""
+        for name, state in summary.items():
+            merged = self._reported.setdefault(name, {"state": CLOSED, "trips": 0, "short_circuited": 0})
+            merged["trips"] += state["trips"]
+            merged["short_circuited"] += state["short_circuited"]
+            if _STATE_VALUES[state["state"]] > _STATE_VALUES[merged["state"]]:
+                merged["state"] = state["state"]
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the state of every breaker that tripped or is not closed."""
+        summary = {
+            name: breaker.as_dict() for name, breaker in self.breakers.items()
+            if breaker.trips or breaker.state != CLOSED
+        }
+        for name, state in self._reported.items():
+            summary[name] = dict(state)
+        return summary
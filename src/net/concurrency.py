@@ -0,0 +1,180 @@
+import asyncio
+import collections
+import contextlib
+import time
+import logging
+from typing import Dict, Any, Deque, Optional, AsyncIterator
+
+import httpx
+
+from src.config import ConfigManager
+from src.metrics import MetricsRegistry
+
+# Set up logging for the concurrency controller
+logger = logging.getLogger(__name__)
+
+CONCURRENCY_WINDOW = MetricsRegistry().gauge(
+    "pro_scanner_concurrency_window", "Current adaptive concurrency limit per platform.", ("platform",)
+)
+WINDOW_DECREASES = MetricsRegistry().counter(
+    "pro_scanner_concurrency_decreases_total", "Times a platform's window was cut, by reason.", ("platform", "reason")
+)
+
+class AimdWindow:
+    """
+    A concurrency limit for one platform that adapts with AIMD, like TCP congestion control.
+    While responses are healthy and the window is in full use it grows by about one slot
+    per window's worth of responses; on a 429/503, a timeout or a latency spike it is cut
+    multiplicatively, at most once per round trip so one burst of errors counts once.
+    """
+
+    # Latency is considered a spike at this multiple of the smoothed latency
+    SPIKE_FACTOR = 3.0
+    # Smoothing factor of the latency average
+    EWMA_ALPHA = 0.1
+    # Responses needed before latency spikes are trusted
+    WARMUP_SAMPLES = 10
+
+    def __init__(self, name: str, initial: float = 4, minimum: float = 1, maximum: float = 32,
+                 decrease_factor: float = 0.5, adaptive: bool = True):
+        self.name = name
+        self.minimum = max(1.0, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(self.maximum, max(self.minimum, initial)) if adaptive else self.maximum
+        self.decrease_factor = decrease_factor
+        self.adaptive = adaptive
+        self.in_flight = 0
+        self.latency: Optional[float] = None
+        self.samples = 0
+        self._last_decrease = 0.0
+        self._waiters: Deque[asyncio.Future] = collections.deque()
+        CONCURRENCY_WINDOW.labels(name).set(self.limit)
+
+    async def acquire(self):
+        """Waits for a free slot in the window, first come first served."""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled; pass it on
+                self.in_flight -= 1
+                self._wake()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def on_success(self, latency: float):
+        """Grows the window after a healthy response, or shrinks it on a latency spike."""
+        self.samples += 1
+        if self.latency is None:
+            self.latency = latency
+        elif self.samples > self.WARMUP_SAMPLES and latency > self.latency * self.SPIKE_FACTOR:
+            self.on_congestion("latency")
+            return
+        else:
+            self.latency += self.EWMA_ALPHA * (latency - self.latency)
+        # Only grow when the window is the bottleneck, not while it sits half empty
+        if self.adaptive and self.in_flight >= int(self.limit) and self.limit < self.maximum:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            CONCURRENCY_WINDOW.labels(self.name).set(self.limit)
+            self._wake()
+
+    def on_congestion(self, reason: str):
+        """Cuts the window after a throttling response, a timeout or a latency spike."""
+        if not self.adaptive:
+            return
+        now = time.monotonic()
+        if now - self._last_decrease < (self.latency or 0.0):
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(self.minimum, self.limit * self.decrease_factor)
+        CONCURRENCY_WINDOW.labels(self.name).set(self.limit)
+        WINDOW_DECREASES.labels(self.name, reason).inc()
+        logger.debug(f"{self.name}: concurrency {previous:.1f} -> {self.limit:.1f} ({reason})")
+
+class ConcurrencyController:
+    """
+    Gives every platform its own AimdWindow. ProScannerCore holds a platform's window
+    around each check; AsyncHttpClient reports every response and timeout per host,
+    which is mapped back to the platforms served by that host.
+    """
+
+    CONGESTION_STATUSES = (429, 503)
+
+    def __init__(self, initial: float = 4, minimum: float = 1, maximum: float = 32,
+                 decrease_factor: float = 0.5, adaptive: bool = True):
+        self.settings = dict(initial=initial, minimum=minimum, maximum=maximum,
+                             decrease_factor=decrease_factor, adaptive=adaptive)
+        self.windows: Dict[str, AimdWindow] = {}
+        self._hosts: Dict[str, list] = {}
+
+    @classmethod
+    def from_config(cls, config: Optional[ConfigManager] = None) -> 'ConcurrencyController':
+        """Builds the controller from scanner.adaptive_concurrency in settings.yml."""
+        config = config or ConfigManager()
+        return cls(
+            initial=config.get_setting("scanner.adaptive_concurrency.initial", 4),
+            minimum=config.get_setting("scanner.adaptive_concurrency.min", 1),
+            maximum=config.get_setting("scanner.adaptive_concurrency.max", 32),
+            decrease_factor=config.get_setting("scanner.adaptive_concurrency.decrease_factor", 0.5),
+            adaptive=bool(config.get_setting("scanner.adaptive_concurrency.enabled", True))
+        )
+
+    def window(self, platform: str) -> AimdWindow:
+        window = self.windows.get(platform)
+        if window is None:
+            window = self.windows[platform] = AimdWindow(platform, **self.settings)
+        return window
+
+    def split(self, parts: int):
+        """Scales every window down to one share of `parts`, like RateLimiter.split."""
+        if parts <= 1:
+            return
+        for key in ("initial", "maximum"):
+            self.settings[key] = max(self.settings["minimum"], self.settings[key] / parts)
+        for window in self.windows.values():
+            window.maximum = max(window.minimum, window.maximum / parts)
+            window.limit = max(window.minimum, min(window.maximum, window.limit / parts))
+            CONCURRENCY_WINDOW.labels(window.name).set(window.limit)
+
+    def bind(self, platform: str, url: str):
+        """Routes the feedback for a URL's host to a platform's window."""
+        self._hosts.setdefault(httpx.URL(url).host, []).append(self.window(platform))
+
+    def observe(self, host: str, status_code: Optional[int], error: Optional[BaseException], latency: float):
+        """AsyncHttpClient observer: feeds one request's outcome to the host's windows."""
+        for window in self._hosts.get(host, ()):
+            if status_code in self.CONGESTION_STATUSES:
+                window.on_congestion(str(status_code))
+            elif isinstance(error, httpx.TimeoutException) and not isinstance(error, httpx.PoolTimeout):
+                window.on_congestion("timeout")
+            elif status_code is not None:
+                window.on_success(latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: round(window.limit, 1) for name, window in self.windows.items()}
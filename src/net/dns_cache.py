@@ -0,0 +1,109 @@
+import asyncio
+import ipaddress
+import socket
+import time
+import logging
+from typing import Dict, List, Optional, Tuple, Iterable
+
+import httpcore
+
+from src.metrics import MetricsRegistry
+
+# Set up logging for the DNS cache
+logger = logging.getLogger(__name__)
+
+DNS_LOOKUPS = MetricsRegistry().counter(
+    "pro_scanner_dns_lookups_total", "Host name resolutions by result (hit, miss, error).", ("result",)
+)
+
+class DnsCache:
+    """
+    A TTL-bounded cache of resolved addresses, shared by every connection in the pool.
+    Concurrent lookups of the same host share one resolver call, so a burst of new
+    connections to a platform costs a single DNS round trip.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, timeout_seconds: float = 10.0):
+        self.ttl = ttl_seconds
+        self.timeout = timeout_seconds
+        self._entries: Dict[Tuple[str, int], Tuple[List[str], float]] = {}
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        """Returns the host's addresses, from the cache while they are fresh."""
+        key = (host, port)
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            DNS_LOOKUPS.labels("hit").inc()
+            return entry[0]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            DNS_LOOKUPS.labels("hit").inc()
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            infos = await asyncio.wait_for(
+                asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM), self.timeout
+            )
+            # Keep the resolver's order (it already prefers reachable families) without duplicates
+            addresses = list(dict.fromkeys(info[4][0] for info in infos))
+            self._entries[key] = (addresses, time.monotonic() + self.ttl)
+            DNS_LOOKUPS.labels("miss").inc()
+            future.set_result(addresses)
+            return addresses
+        except (OSError, asyncio.TimeoutError) as e:
+            DNS_LOOKUPS.labels("error").inc()
+            error = httpcore.ConnectError(f"Could not resolve {host}: {e}")
+            future.set_exception(error)
+            # Nobody else may be waiting; mark the exception as retrieved
+            future.exception()
+            raise error from e
+        finally:
+            del self._inflight[key]
+
+    def forget(self, host: str, port: int):
+        """Drops a cached entry, e.g. after every address in it refused connections."""
+        self._entries.pop((host, port), None)
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """
+    Wraps httpcore's network backend so TCP connections are opened to addresses from a
+    DnsCache instead of resolving the host on every connect. TLS still verifies and
+    sends SNI for the original host name, which httpcore passes separately.
+    """
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, cache: DnsCache):
+        self.backend = backend
+        self.cache = cache
+
+    async def connect_tcp(self, host: str, port: int, timeout: Optional[float] = None,
+                          local_address: Optional[str] = None,
+                          socket_options: Optional[Iterable] = None) -> httpcore.AsyncNetworkStream:
+        if _is_ip(host):
+            return await self.backend.connect_tcp(host, port, timeout, local_address, socket_options)
+        error: Optional[Exception] = None
+        for address in await self.cache.resolve(host, port):
+            try:
+                return await self.backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        # The host may have moved; resolve afresh next time
+        self.cache.forget(host, port)
+        raise error or httpcore.ConnectError(f"No addresses for {host}")
+
+    async def connect_unix_socket(self, path: str, timeout: Optional[float] = None,
+                                  socket_options: Optional[Iterable] = None) -> httpcore.AsyncNetworkStream:
+        return await self.backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float):
+        await self.backend.sleep(seconds)
@@ -1,23 +1,88 @@
 import httpx
 import asyncio
+import contextlib
 import logging
-from typing import Dict, Any, Optional
+import time
+import importlib.util
+from typing import Dict, Any, Optional, AsyncIterator, Tuple, Iterable, List, Callable
+
+from src.config import ConfigManager
+from src.net.rate_limiter import RateLimiter
+from src.net.retry import RetryPolicy, LatencyTracker
+from src.net.dns_cache import DnsCache, CachingNetworkBackend
+from src.metrics import MetricsRegistry
 
 # Set up logging for the HTTP client
 logger = logging.getLogger(__name__)
 
+RATE_LIMIT_WAIT = MetricsRegistry().histogram(
+    "pro_scanner_rate_limit_wait_seconds", "Time requests spent waiting for a rate-limit token.", ("host",),
+    buckets=(0.0, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+CONNECTIONS_OPENED = MetricsRegistry().counter(
+    "pro_scanner_connections_opened_total", "New TCP connections opened.", ("host",)
+)
+TLS_HANDSHAKES = MetricsRegistry().counter(
+    "pro_scanner_tls_handshakes_total", "TLS handshakes performed.", ("host",)
+)
+CONNECTIONS_REUSED = MetricsRegistry().counter(
+    "pro_scanner_connections_reused_total", "Requests sent over an already open, kept-alive connection.", ("host",)
+)
+RETRIES = MetricsRegistry().counter("pro_scanner_retries_total", "Requests retried after a transient failure.", ("host",))
+HEDGES = MetricsRegistry().counter("pro_scanner_hedged_requests_total", "Hedge requests sent for slow requests.", ("host",))
+
+def _connection_tracer(host: str):
+    """
+    Returns an httpcore trace callback that tells new connections from reused ones.
+    A request that gets to sending its headers without connecting first rode a pooled connection.
+    """
+    connected = False
+
+    async def trace(event: str, info: Dict[str, Any]):
+        nonlocal connected
+        if event == "connection.connect_tcp.complete":
+            connected = True
+            CONNECTIONS_OPENED.labels(host).inc()
+        elif event == "connection.start_tls.complete":
+            TLS_HANDSHAKES.labels(host).inc()
+        elif event.endswith("send_request_headers.started") and not connected:
+            CONNECTIONS_REUSED.labels(host).inc()
+    return trace
+
+# Hop-by-hop headers are illegal on HTTP/2 connections
+HOP_BY_HOP_HEADERS = ("connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade")
+
 class AsyncHttpClient:
     """
     An asynchronous HTTP client for all network requests.
     Manages a single httpx.AsyncClient instance for efficient connection pooling.
+    Every detector shares this pool, so each host pays its TCP+TLS handshake once
+    per process and later requests reuse the kept-alive connection.
     """
     
     _instance = None
     _client: Optional[httpx.AsyncClient] = None
+    # Replaces the network transport when set, e.g. with an httpx.MockTransport for benchmarks
+    transport: Optional[httpx.AsyncBaseTransport] = None
     
     # Use a lock to prevent race conditions during instance creation in a threaded environment
     _lock = asyncio.Lock()
 
+    def __init__(self):
+        self._http2 = False
+        self._max_per_host = 0
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self.rate_limiter: Optional[RateLimiter] = None
+        self.retry_policy = RetryPolicy(attempts=0)
+        self.latency = LatencyTracker()
+        self._hedging = False
+        self.dns_cache: Optional[DnsCache] = None
+        # Called as observer(host, status_code, error, latency) after every attempt
+        self.observers: List[Callable[[str, Optional[int], Optional[BaseException], float], None]] = []
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
     @classmethod
     async def get_instance(cls):
         """Returns a singleton instance of the client."""
@@ -29,15 +94,257 @@ class AsyncHttpClient:
         return cls._instance
 
     async def _init_client(self):
-        """Initializes the httpx.AsyncClient."""
+        """Initializes the httpx.AsyncClient from the network.pool settings."""
+        if self._client is None:
+            config = ConfigManager()
+            limits = httpx.Limits(
+                max_connections=config.get_setting("network.pool.max_connections", 100),
+                max_keepalive_connections=config.get_setting("network.pool.max_keepalive_connections", 50),
+                keepalive_expiry=config.get_setting("network.pool.keepalive_expiry_seconds", 30.0)
+            )
+            self._max_per_host = config.get_setting("network.pool.max_connections_per_host", 10)
+            self.rate_limiter = RateLimiter.from_config(config)
+            self.retry_policy = RetryPolicy.from_config(config)
+            self._hedging = bool(config.get_setting("network.hedging.enabled", False))
+            self.latency = LatencyTracker(
+                window=config.get_setting("network.hedging.window", 200),
+                min_samples=config.get_setting("network.hedging.min_samples", 20),
+                percentile=config.get_setting("network.hedging.percentile", 95)
+            )
+
+            self._http2 = bool(config.get_setting("network.pool.http2", False))
+            if self._http2 and importlib.util.find_spec("h2") is None:
+                logger.warning("HTTP/2 requested but the 'h2' package is not installed. Falling back to HTTP/1.1.")
+                self._http2 = False
+
+            transport = self.transport
+            if transport is None:
+                transport = httpx.AsyncHTTPTransport(limits=limits, http2=self._http2)
+                if config.get_setting("network.dns.enabled", True):
+                    self.dns_cache = DnsCache(
+                        ttl_seconds=config.get_setting("network.dns.ttl_seconds", 300),
+                        timeout_seconds=config.get_setting("network.timeout_seconds", 30.0)
+                    )
+                    self._install_dns_cache(transport)
+
+            self._client = httpx.AsyncClient(
+                timeout=config.get_setting("network.timeout_seconds", 30.0),
+                limits=limits,
+                http2=self._http2,
+                transport=transport
+            )
+            logger.info(f"HTTP client initialized successfully (http2={self._http2}, per-host limit={self._max_per_host}).")
+
+    def _install_dns_cache(self, transport: httpx.AsyncHTTPTransport):
+        """Routes the pool's connects through the shared DNS cache."""
+        # httpx has no public hook for the resolver, so wrap httpcore's network backend
+        pool = getattr(transport, "_pool", None)
+        backend = getattr(pool, "_network_backend", None)
+        if backend is None:
+            logger.warning("This httpx version does not expose its network backend; DNS caching is disabled.")
+            self.dns_cache = None
+            return
+        pool._network_backend = CachingNetworkBackend(backend, self.dns_cache)
+
+    async def prewarm(self, urls: Iterable[str], timeout: float = 5.0):
+        """
+        Resolves and connects to each URL's origin ahead of the first real request, so
+        DNS, TCP and TLS setup are off the critical path. Each origin gets a HEAD
+        request for '/', whose kept-alive connection then serves the scan. Failures
+        are ignored: the real request will simply connect as usual.
+        """
+        if self._client is None:
+            await self._init_client()
+        origins = {}
+        for url in urls:
+            parsed = httpx.URL(url)
+            origins[(parsed.scheme, parsed.host, parsed.port)] = parsed.copy_with(path="/", query=None, fragment=None)
+
+        async def warm(origin: httpx.URL):
+            try:
+                async with self._limited(str(origin)):
+                    response = await self._client.head(origin, timeout=timeout, follow_redirects=False)
+                await response.aclose()
+            except httpx.HTTPError as e:
+                logger.debug(f"Pre-warming {origin.host} failed: {e}")
+
+        started = time.monotonic()
+        await asyncio.gather(*(warm(origin) for origin in origins.values()))
+        logger.info(f"🔥 Pre-warmed {len(origins)} hosts in {time.monotonic() - started:.2f}s.")
+
+    def share_limits(self, parts: int):
+        """Gives this process one share of the configured per-host rate and connection limits."""
+        if parts <= 1:
+            return
+        self.rate_limiter.split(parts)
+        if self._max_per_host > 0:
+            self._max_per_host = max(1, self._max_per_host // parts)
+        self._host_slots.clear()
+
+    def _host_slot(self, url: str) -> Optional[asyncio.Semaphore]:
+        """Returns the semaphore capping concurrent connections to the URL's host."""
+        if self._max_per_host <= 0:
+            return None
+        host = httpx.URL(url).host
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self._max_per_host)
+        return slot
+
+    def _prepare(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Drops headers that would break an HTTP/2 request."""
+        if self._http2 and kwargs.get("headers"):
+            kwargs["headers"] = {k: v for k, v in kwargs["headers"].items() if k.lower() not in HOP_BY_HOP_HEADERS}
+        return kwargs
+
+    @contextlib.asynccontextmanager
+    async def _limited(self, url: str) -> AsyncIterator[None]:
+        """Holds a rate-limit token and a connection slot for the URL's host."""
+        if self._client is None:
+            await self._init_client()
+        waited = await self.rate_limiter.acquire(url)
+        RATE_LIMIT_WAIT.labels(httpx.URL(url).host).observe(waited)
+        slot = self._host_slot(url)
+        async with (slot if slot is not None else contextlib.nullcontext()):
+            yield
+
+    async def _open(self, method: str, url: str, kwargs: Dict[str, Any]) -> Tuple[httpx.Response, contextlib.AsyncExitStack]:
+        """
+        Sends one request and returns its response with the body still unread.
+        The returned exit stack closes the response and releases the host's slot.
+        """
+        stack = contextlib.AsyncExitStack()
+        try:
+            await stack.enter_async_context(self._limited(url))
+            kwargs = dict(kwargs)
+            follow_redirects = kwargs.pop("follow_redirects", httpx.USE_CLIENT_DEFAULT)
+            request = self._client.build_request(method, url, **self._prepare(kwargs))
+            request.extensions["trace"] = _connection_tracer(request.url.host)
+            started = time.monotonic()
+            try:
+                response = await self._client.send(request, stream=True, follow_redirects=follow_redirects)
+            except httpx.HTTPError as e:
+                self._notify(request.url.host, None, e, time.monotonic() - started)
+                raise
+            stack.push_async_callback(response.aclose)
+            elapsed = time.monotonic() - started
+            self.latency.observe(request.url.host, elapsed)
+            self.rate_limiter.feedback(url, response)
+            self._notify(request.url.host, response.status_code, None, elapsed)
+            return response, stack
+        except BaseException:
+            await stack.aclose()
+            raise
+
+    def _notify(self, host: str, status_code: Optional[int], error: Optional[BaseException], latency: float):
+        for observer in self.observers:
+            observer(host, status_code, error, latency)
+
+    @staticmethod
+    async def _discard(task: asyncio.Task):
+        """Cancels a losing attempt and closes its response if it got one anyway."""
+        task.cancel()
+        try:
+            _, stack = await task
+        except BaseException:
+            return
+        await stack.aclose()
+
+    async def _open_hedged(self, method: str, url: str, kwargs: Dict[str, Any]) -> Tuple[httpx.Response, contextlib.AsyncExitStack]:
+        """
+        Sends the request and, if it is still waiting for a response after the host's
+        observed p95 latency, sends an identical second one. The first to answer wins.
+        """
+        delay = None
+        if self._hedging and method.upper() in RetryPolicy.IDEMPOTENT_METHODS:
+            delay = self.latency.threshold(httpx.URL(url).host)
+        if delay is None:
+            return await self._open(method, url, kwargs)
+
+        primary = asyncio.ensure_future(self._open(method, url, kwargs))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+
+            self.hedges += 1
+            HEDGES.labels(httpx.URL(url).host).inc()
+            hedge = asyncio.ensure_future(self._open(method, url, kwargs))
+            pending.add(hedge)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        # Any other finished attempt is closed below via `done`
+                        for other in done - {task}:
+                            pending.add(other)
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                await self._discard(task)
+
+    async def _open_with_retry(self, method: str, url: str, kwargs: Dict[str, Any]) -> Tuple[httpx.Response, contextlib.AsyncExitStack]:
+        """Opens a request, retrying transient failures with jittered exponential backoff."""
         if self._client is None:
-            self._client = httpx.AsyncClient(timeout=30.0)
-            logger.info("HTTP client initialized successfully.")
+            await self._init_client()
+        attempt = 0
+        while True:
+            try:
+                response, stack = await self._open_hedged(method, url, kwargs)
+            except httpx.HTTPError as e:
+                if not self.retry_policy.should_retry_error(method, e, attempt):
+                    raise
+                delay = self.retry_policy.backoff(attempt)
+                logger.warning(f"{method} {url} failed ({type(e).__name__}); retry {attempt + 1} in {delay:.2f}s.")
+            else:
+                if not self.retry_policy.should_retry_status(method, response.status_code, attempt):
+                    return response, stack
+                await stack.aclose()
+                delay = self.retry_policy.backoff(attempt)
+                logger.warning(f"{method} {url} returned {response.status_code}; retry {attempt + 1} in {delay:.2f}s.")
+            self.retries += 1
+            RETRIES.labels(httpx.URL(url).host).inc()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Sends a request through the shared pool, honouring the host's rate and connection limits."""
+        response, stack = await self._open_with_retry(method, url, kwargs)
+        async with stack:
+            await response.aread()
+        return response
+
+    @contextlib.asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """
+        Opens a streamed request. The body is only downloaded as the caller iterates it,
+        so detectors can stop reading as soon as they have an answer. The host's
+        connection slot is held until the block exits.
+        """
+        try:
+            response, stack = await self._open_with_retry(method, url, kwargs)
+        except httpx.ConnectError as e:
+            logger.error(f"Connection error to {url}: {e}")
+            raise
+        except httpx.TimeoutException as e:
+            logger.error(f"Request to {url} timed out: {e}")
+            raise
+        except httpx.RequestError as e:
+            logger.error(f"An error occurred while requesting {url}: {e}")
+            raise
+        async with stack:
+            yield response
 
     async def get(self, url: str, **kwargs: Any) -> httpx.Response:
         """Performs an asynchronous GET request."""
         try:
-            return await self._client.get(url, **kwargs)
+            return await self._send("GET", url, **kwargs)
         except httpx.ConnectError as e:
             logger.error(f"Connection error to {url}: {e}")
             raise
@@ -51,7 +358,7 @@ class AsyncHttpClient:
     async def post(self, url: str, **kwargs: Any) -> httpx.Response:
         """Performs an asynchronous POST request."""
         try:
-            return await self._client.post(url, **kwargs)
+            return await self._send("POST", url, **kwargs)
         except httpx.ConnectError as e:
             logger.error(f"Connection error to {url}: {e}")
             raise
@@ -65,7 +372,11 @@ class AsyncHttpClient:
     async def close(self):
         """Closes the client session."""
         if self._client:
+            if self.retries or self.hedges:
+                logger.info(f"Retried {self.retries} requests; hedged {self.hedges} ({self.hedge_wins} won by the hedge).")
             await self._client.aclose()
             self._client = None
+            self.observers.clear()
+            if AsyncHttpClient._instance is self:
+                AsyncHttpClient._instance = None
             logger.info("HTTP client session closed.")
-
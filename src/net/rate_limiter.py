@@ -0,0 +1,165 @@
+import asyncio
+import time
+import logging
+import email.utils
+from typing import Dict, Optional
+
+import httpx
+
+from src.config import ConfigManager
+
+# Set up logging for the rate limiter
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """
+    An async token bucket for a single host.
+    The refill rate adapts to the host's feedback: it halves on every 429 and
+    creeps back up towards the configured ceiling while requests succeed.
+    """
+
+    # Fraction of the configured rate regained after each successful response
+    RECOVERY_STEP = 0.05
+
+    def __init__(self, requests_per_minute: float, burst: float, min_requests_per_minute: float):
+        self.max_rate = requests_per_minute / 60.0
+        self.min_rate = min(min_requests_per_minute / 60.0, self.max_rate)
+        self.rate = self.max_rate
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        # Waiters are served in FIFO order
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> float:
+        """Waits for a token and returns the number of seconds spent waiting."""
+        start = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return time.monotonic() - start
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def penalize(self, retry_after: Optional[float]):
+        """Backs off after the host signalled that we are going too fast."""
+        now = time.monotonic()
+        self._refill(now)
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = 0.0
+        if retry_after is None:
+            retry_after = 1.0 / self.rate
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def reward(self):
+        """Recovers part of the configured rate after a successful response."""
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * self.RECOVERY_STEP)
+
+class RateLimiter:
+    """
+    Keeps a separate token bucket per host so each platform is driven as close
+    to its allowed request rate as possible without tripping its throttling.
+    """
+
+    THROTTLE_STATUSES = (429, 503)
+
+    def __init__(self, requests_per_minute: float = 60, burst: Optional[float] = None,
+                 min_requests_per_minute: Optional[float] = None,
+                 host_limits: Optional[Dict[str, float]] = None, enabled: bool = True):
+        self.enabled = enabled
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst if burst is not None else max(1.0, requests_per_minute / 60.0)
+        self.min_requests_per_minute = min_requests_per_minute if min_requests_per_minute is not None else requests_per_minute / 10.0
+        self.host_limits = host_limits or {}
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    @classmethod
+    def from_config(cls, config: Optional[ConfigManager] = None) -> 'RateLimiter':
+        """
+        Builds a limiter from network.rate_limit in settings.yml.
+        Platforms may override the default with their own `requests_per_minute`,
+        which applies to the host of their URL.
+        """
+        config = config or ConfigManager()
+        host_limits: Dict[str, float] = {}
+        for platform in config.get_platforms().values():
+            rpm = platform.get("requests_per_minute")
+            url = platform.get("api_url") or platform.get("url")
+            if rpm and url:
+                host_limits[httpx.URL(url.format("x")).host] = rpm
+        host_limits.update(config.get_setting("network.rate_limit.hosts", {}) or {})
+
+        return cls(
+            requests_per_minute=config.get_setting("network.rate_limit.requests_per_minute", 60),
+            burst=config.get_setting("network.rate_limit.burst", None),
+            min_requests_per_minute=config.get_setting("network.rate_limit.min_requests_per_minute", None),
+            host_limits=host_limits,
+            enabled=bool(config.get_setting("network.rate_limit.enabled", True))
+        )
+
+    def split(self, parts: int):
+        """
+        Scales every limit down to one share of `parts`, for when several processes
+        each run their own limiter against the same hosts.
+        """
+        if parts <= 1:
+            return
+        self.requests_per_minute /= parts
+        self.burst = max(1.0, self.burst / parts)
+        self.min_requests_per_minute /= parts
+        self.host_limits = {host: rpm / parts for host, rpm in self.host_limits.items()}
+        self._buckets.clear()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rpm = self.host_limits.get(host, self.requests_per_minute)
+            burst = self.burst if host not in self.host_limits else max(1.0, rpm / 60.0)
+            bucket = self._buckets[host] = TokenBucket(rpm, burst, min(self.min_requests_per_minute, rpm))
+        return bucket
+
+    async def acquire(self, url: str) -> float:
+        """Waits until a request to the URL's host is allowed. Returns the wait in seconds."""
+        if not self.enabled:
+            return 0.0
+        return await self._bucket(httpx.URL(url).host).acquire()
+
+    def feedback(self, url: str, response: httpx.Response):
+        """Adapts the host's bucket to the response it just returned."""
+        if not self.enabled:
+            return
+        bucket = self._bucket(httpx.URL(url).host)
+        if response.status_code in self.THROTTLE_STATUSES:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            bucket.penalize(retry_after)
+            logger.warning(
+                f"{httpx.URL(url).host} throttled us ({response.status_code}). "
+                f"Slowing to {bucket.rate * 60:.1f} req/min."
+            )
+        else:
+            bucket.reward()
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
@@ -0,0 +1,88 @@
+import random
+import logging
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import httpx
+
+from src.config import ConfigManager
+
+# Set up logging for the retry policy
+logger = logging.getLogger(__name__)
+
+class RetryPolicy:
+    """
+    Decides which failed requests are worth another attempt and how long to wait first.
+    Failures where the request never reached the server (connect errors, pool timeouts)
+    are retried for any method; anything else only for idempotent methods, since the
+    server may already have acted on the first attempt.
+    """
+
+    IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+    # The request was never sent, so retrying is always safe
+    UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+    # The request may have been sent; only safe to repeat when idempotent
+    TRANSIENT_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+    RETRY_STATUSES = frozenset((429, 502, 503, 504))
+
+    def __init__(self, attempts: int = 3, backoff_seconds: float = 0.5, max_backoff_seconds: float = 10.0):
+        self.attempts = max(0, int(attempts))
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+
+    @classmethod
+    def from_config(cls, config: Optional[ConfigManager] = None) -> 'RetryPolicy':
+        """Builds the policy from network.retry_attempts and the network.retry_* backoff settings."""
+        config = config or ConfigManager()
+        return cls(
+            attempts=config.get_setting("network.retry_attempts", 3),
+            backoff_seconds=config.get_setting("network.retry_backoff_seconds", 0.5),
+            max_backoff_seconds=config.get_setting("network.retry_max_backoff_seconds", 10.0)
+        )
+
+    def should_retry_error(self, method: str, error: Exception, attempt: int) -> bool:
+        """Whether a request that raised `error` on attempt number `attempt` (0-based) may be retried."""
+        if attempt >= self.attempts:
+            return False
+        if isinstance(error, self.UNSENT_ERRORS):
+            return True
+        return method.upper() in self.IDEMPOTENT_METHODS and isinstance(error, self.TRANSIENT_ERRORS)
+
+    def should_retry_status(self, method: str, status_code: int, attempt: int) -> bool:
+        """Whether a response with a transient error status may be retried."""
+        return (
+            attempt < self.attempts
+            and method.upper() in self.IDEMPOTENT_METHODS
+            and status_code in self.RETRY_STATUSES
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter, so retries from many workers do not line up."""
+        return random.uniform(0, min(self.max_backoff_seconds, self.backoff_seconds * 2 ** attempt))
+
+class LatencyTracker:
+    """
+    Keeps a rolling window of recent response times per host and reports a
+    percentile of it. Used to decide when a slow request deserves a hedge.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20, percentile: float = 95):
+        self.window = window
+        self.min_samples = min_samples
+        self.percentile = percentile
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def observe(self, host: str, seconds: float):
+        samples = self._samples.get(host)
+        if samples is None:
+            samples = self._samples[host] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def threshold(self, host: str) -> Optional[float]:
+        """Returns the host's latency percentile, or None until enough samples are in."""
+        samples = self._samples.get(host)
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return ordered[index]
@@ -0,0 +1,389 @@
+import asyncio
+import collections
+import itertools
+import json
+import os
+import time
+import logging
+from typing import Dict, List, Any, Deque, Optional, Tuple
+
+from src.config import ConfigManager
+from src.core import ProScannerCore, NullProgressBar
+from src.detectors.engine import PlatformRules
+from src.utils.input_stream import normalize_username
+
+# Set up logging for the scan service
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, COMPLETED, CANCELLED = "QUEUED", "RUNNING", "COMPLETED", "CANCELLED"
+
+class ServiceJob:
+    """
+    One submitted scan: a list of usernames checked against a set of platforms.
+    Results are kept in completion order so any number of clients can stream them,
+    from the beginning, while the job runs and until it expires.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, tenant: str, usernames: List[str], sites: List[Tuple[str, PlatformRules]]):
+        self.job_id = next(self._ids)
+        self.tenant = tenant
+        self.usernames = usernames
+        self.sites = sites
+        self.status = QUEUED
+        self.results: List[Dict[str, Any]] = []
+        self.total = len(usernames) * len(sites)
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        # Cells are handed out lazily, username by username
+        self._cells = ((index, slot) for index in range(len(usernames)) for slot in range(len(sites)))
+        self._pending_platforms = [len(sites)] * len(usernames)
+        self._started: Dict[int, float] = {}
+        # index -> (platform, result) pairs, saved with the username's session
+        self._finished_cells: Dict[int, List[Tuple[str, Dict[str, Any]]]] = {}
+        self._in_flight = 0
+        self._exhausted = False
+        self._changed = asyncio.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.status in (COMPLETED, CANCELLED)
+
+    def next_cell(self) -> Optional[Tuple[int, int]]:
+        if self._exhausted or self.done:
+            return None
+        cell = next(self._cells, None)
+        if cell is None:
+            self._exhausted = True
+        return cell
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "tenant": self.tenant,
+            "status": self.status,
+            "usernames": len(self.usernames),
+            "platforms": [site_name for site_name, _ in self.sites],
+            "total": self.total,
+            "completed": len(self.results),
+            "created": self.created,
+            "finished": self.finished
+        }
+
+    async def _notify(self):
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def follow(self):
+        """Yields every result of the job, waiting for new ones until it is done."""
+        sent = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: sent < len(self.results) or self.done)
+            while sent < len(self.results):
+                yield self.results[sent]
+                sent += 1
+            if self.done and sent >= len(self.results):
+                return
+
+class FairScheduler:
+    """
+    Hands out (job, username, platform) cells round-robin across tenants, so a tenant
+    who submits one huge job cannot starve others' small ones: each backlogged tenant
+    gets an equal share of the request slots. Within a tenant, jobs run in FIFO order.
+    """
+
+    def __init__(self):
+        self._tenants: "collections.OrderedDict[str, Deque[ServiceJob]]" = collections.OrderedDict()
+        self._ready = asyncio.Event()
+
+    def submit(self, job: ServiceJob):
+        self._tenants.setdefault(job.tenant, collections.deque()).append(job)
+        self._ready.set()
+
+    def backlog(self) -> Dict[str, int]:
+        return {tenant: len(jobs) for tenant, jobs in self._tenants.items()}
+
+    def _take(self) -> Optional[Tuple[ServiceJob, int, int]]:
+        for _ in range(len(self._tenants)):
+            tenant, jobs = next(iter(self._tenants.items()))
+            # The tenant moves to the back of the line whether or not it had work
+            self._tenants.move_to_end(tenant)
+            while jobs:
+                cell = jobs[0].next_cell()
+                if cell is not None:
+                    return (jobs[0],) + cell
+                jobs.popleft()
+            del self._tenants[tenant]
+        return None
+
+    async def next(self) -> Tuple[ServiceJob, int, int]:
+        """Waits for the next cell to run."""
+        while True:
+            taken = self._take()
+            if taken is not None:
+                return taken
+            self._ready.clear()
+            await self._ready.wait()
+
+class ScanService:
+    """
+    Keeps a ProScannerCore warm (config, compiled platforms, HTTP pool, DNS cache and
+    database connection) and serves scan jobs over a small local HTTP API, on TCP or a
+    Unix socket:
+
+      POST   /jobs               {"usernames": [...], "platforms": [...], "tenant": "..."}
+      POST   /jobs?stream=1      the same, answered with the results as NDJSON
+      GET    /jobs               every retained job's status
+      GET    /jobs/<id>          one job's status
+      GET    /jobs/<id>/results  the job's results as NDJSON, streamed until it finishes
+      DELETE /jobs/<id>          cancels the job
+      GET    /health
+    """
+
+    MAX_BODY_BYTES = 16 * 1024 * 1024
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8787, socket_path: Optional[str] = None,
+                 concurrency: Optional[int] = None, max_usernames: int = 10000, job_ttl: float = 3600.0,
+                 use_cache: bool = True):
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.max_usernames = max_usernames
+        self.job_ttl = job_ttl
+        self.scanner = ProScannerCore(use_cache=use_cache, workers=1, show_progress=False)
+        self.concurrency = max(1, concurrency or self.scanner.concurrency)
+        self.scheduler = FairScheduler()
+        self.jobs: Dict[int, ServiceJob] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running = set()
+        self._no_progress = NullProgressBar()
+
+    @classmethod
+    def from_config(cls, config: Optional[ConfigManager] = None, **overrides) -> 'ScanService':
+        """Builds the service from the `service` settings; keyword arguments that are not None win."""
+        config = config or ConfigManager()
+        settings = dict(
+            host=config.get_setting("service.host", "127.0.0.1"),
+            port=config.get_setting("service.port", 8787),
+            socket_path=config.get_setting("service.socket", None),
+            concurrency=config.get_setting("service.concurrency", None),
+            max_usernames=config.get_setting("service.max_usernames_per_job", 10000),
+            job_ttl=config.get_setting("service.job_ttl_seconds", 3600.0)
+        )
+        settings.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(**settings)
+
+    async def start(self):
+        await self.scanner._ensure_ready()
+        if self.socket_path:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self._server = await asyncio.start_unix_server(self._serve, self.socket_path)
+            where = f"unix:{self.socket_path}"
+        else:
+            self._server = await asyncio.start_server(self._serve, self.host, self.port)
+            where = f"http://{self.host}:{self.port}"
+        self._tasks = [asyncio.create_task(self._dispatch()), asyncio.create_task(self._expire_jobs())]
+        logger.info(f"🛰️ Scan service listening on {where} ({self.concurrency} concurrent checks)")
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            if self.socket_path and os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+        for task in self._tasks + list(self._running):
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._running, return_exceptions=True)
+        self._tasks.clear()
+        await self.scanner.close()
+        logger.info("Scan service stopped.")
+
+    def submit(self, tenant: str, usernames: List[str], platforms: Optional[List[str]] = None) -> ServiceJob:
+        """Queues a job. Raises ValueError for an empty or oversized list or an unknown platform."""
+        usernames = [name for name in (normalize_username(str(username)) for username in usernames) if name]
+        if not usernames:
+            raise ValueError("no usernames given")
+        if len(usernames) > self.max_usernames:
+            raise ValueError(f"at most {self.max_usernames} usernames per job")
+        sites = self.scanner._dispatchable_platforms()
+        if platforms:
+            unknown = set(platforms) - set(self.scanner.platforms)
+            if unknown:
+                raise ValueError(f"Unknown platform(s): {', '.join(sorted(unknown))}")
+            sites = [(site_name, rules) for site_name, rules in sites if site_name in platforms]
+        job = ServiceJob(tenant, usernames, sites)
+        self.jobs[job.job_id] = job
+        self.scheduler.submit(job)
+        logger.info(f"📥 Job #{job.job_id} from {tenant}: {len(usernames)} usernames x {len(sites)} platforms")
+        return job
+
+    async def cancel(self, job: ServiceJob):
+        if not job.done:
+            job.status = CANCELLED
+            job.finished = time.time()
+            await job._notify()
+
+    async def _dispatch(self):
+        """Runs cells from the scheduler with at most `concurrency` in flight."""
+        slots = asyncio.Semaphore(self.concurrency)
+        while True:
+            await slots.acquire()
+            try:
+                job, index, slot = await self.scheduler.next()
+            except BaseException:
+                slots.release()
+                raise
+            if job.status == QUEUED:
+                job.status = RUNNING
+            job._in_flight += 1
+            task = asyncio.create_task(self._run_cell(job, index, slot))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+    async def _run_cell(self, job: ServiceJob, index: int, slot: int):
+        site_name, rules = job.sites[slot]
+        username = job.usernames[index]
+        scanner = self.scanner
+        job._started.setdefault(index, time.monotonic())
+        try:
+            async with scanner.windows.window(site_name).slot():
+                result = await scanner._scan_site(username, site_name, rules, self._no_progress)
+        except Exception as e:
+            logger.error(f"Job #{job.job_id}: {site_name} check for {username} failed: {e}")
+            result = {"site": rules.name, "status": "ERROR", "url": rules.url_for(username), "error": str(e)}
+        finally:
+            job._in_flight -= 1
+        if job.status == CANCELLED:
+            return
+        job.results.append(dict(result, username=username))
+        job._finished_cells.setdefault(index, []).append((site_name, result))
+        job._pending_platforms[index] -= 1
+        if job._pending_platforms[index] == 0:
+            await scanner.db_manager.save_session(
+                username, len(job.sites), time.monotonic() - job._started.pop(index), job._finished_cells.pop(index)
+            )
+        if len(job.results) == job.total:
+            job.status = COMPLETED
+            job.finished = time.time()
+            logger.info(f"✅ Job #{job.job_id} completed ({job.total} checks)")
+        await job._notify()
+
+    async def _expire_jobs(self):
+        """Forgets finished jobs once they have been kept for `job_ttl` seconds."""
+        while True:
+            await asyncio.sleep(min(60.0, self.job_ttl))
+            cutoff = time.time() - self.job_ttl
+            for job_id in [job_id for job_id, job in self.jobs.items() if job.done and job.finished < cutoff]:
+                del self.jobs[job_id]
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """A minimal HTTP/1.1 responder; every response closes the connection."""
+        try:
+            method, path, headers, body = await _read_request(reader, self.MAX_BODY_BYTES)
+            await self._route(method, path, headers, body, writer)
+        except _HttpError as e:
+            _respond(writer, e.status, {"error": e.message})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+            writer.close()
+
+    async def _route(self, method: str, path: str, headers: Dict[str, str], body: bytes, writer: asyncio.StreamWriter):
+        path, _, query = path.partition("?")
+        parts = [part for part in path.split("/") if part]
+
+        if parts == ["health"] and method == "GET":
+            _respond(writer, "200 OK", {"status": "ok", "jobs": len(self.jobs), "backlog": self.scheduler.backlog()})
+            return
+        if parts == ["jobs"] and method == "GET":
+            _respond(writer, "200 OK", [job.as_dict() for job in self.jobs.values()])
+            return
+        if parts == ["jobs"] and method == "POST":
+            try:
+                request = json.loads(body or b"{}")
+                usernames = request["usernames"]
+                if isinstance(usernames, str) or not isinstance(usernames, list):
+                    raise ValueError("'usernames' must be a list")
+                tenant = str(request.get("tenant") or headers.get("x-tenant") or "default")
+                job = self.submit(tenant, usernames, request.get("platforms"))
+            except (ValueError, KeyError, TypeError) as e:
+                raise _HttpError("400 Bad Request", f"Invalid job: {e}")
+            if "stream=1" in query.split("&"):
+                await _stream_results(writer, job)
+            else:
+                _respond(writer, "202 Accepted", job.as_dict())
+            return
+
+        if len(parts) >= 2 and parts[0] == "jobs":
+            try:
+                job = self.jobs[int(parts[1])]
+            except (ValueError, KeyError):
+                raise _HttpError("404 Not Found", "No such job")
+            if len(parts) == 2 and method == "GET":
+                _respond(writer, "200 OK", job.as_dict())
+                return
+            if len(parts) == 2 and method == "DELETE":
+                await self.cancel(job)
+                _respond(writer, "200 OK", job.as_dict())
+                return
+            if parts[2:] == ["results"] and method == "GET":
+                await _stream_results(writer, job)
+                return
+        raise _HttpError("404 Not Found", f"No route for {method} {path}")
+
+class _HttpError(Exception):
+    def __init__(self, status: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+async def _read_request(reader: asyncio.StreamReader, max_body: int) -> Tuple[str, str, Dict[str, str], bytes]:
+    request_line = (await reader.readline()).decode("latin-1").split()
+    if len(request_line) < 2:
+        raise _HttpError("400 Bad Request", "Malformed request line")
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length") or 0)
+    if length > max_body:
+        raise _HttpError("413 Payload Too Large", "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return request_line[0].upper(), request_line[1], headers, body
+
+def _respond(writer: asyncio.StreamWriter, status: str, payload: Any):
+    body = json.dumps(payload, default=str).encode()
+    writer.write(
+        f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        f"Connection: close\r\n\r\n".encode() + body
+    )
+
+async def _stream_results(writer: asyncio.StreamWriter, job: ServiceJob):
+    """Writes the job's results as NDJSON as they arrive; the body ends when the connection closes."""
+    writer.write(
+        f"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nX-Job-Id: {job.job_id}\r\n"
+        f"Connection: close\r\n\r\n".encode()
+    )
+    await writer.drain()
+    async for result in job.follow():
+        writer.write(json.dumps(result, default=str).encode() + b"\n")
+        await writer.drain()
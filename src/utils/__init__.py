@@ -1,7 +1,27 @@
 # This file declares the 'utils' directory as a sub-package.
-from .cli_utils import (
-    print_banner,
-    print_results,
-    setup_logging,
-    Colors
-)
+# Re-exports are resolved lazily (PEP 562), so importing a light helper such as
+# src.utils.output does not pull in rich through cli_utils.
+import importlib
+
+_EXPORTS = {
+    "print_banner": ".cli_utils",
+    "print_results": ".cli_utils",
+    "print_result_line": ".cli_utils",
+    "setup_logging": ".cli_utils",
+    "Colors": ".cli_utils",
+    "ProgressBar": ".cli_utils",
+    "NdjsonWriter": ".output",
+    "UsernameStream": ".input_stream",
+    "normalize_username": ".input_stream",
+    "BloomFilter": ".bloom",
+    "generate_variants": ".variants",
+    "generate_sweep": ".variants",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
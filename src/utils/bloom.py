@@ -0,0 +1,52 @@
+import hashlib
+import math
+
+class BloomFilter:
+    """
+    A fixed-size Bloom filter for membership checks in constant memory.
+    Sized from the expected number of items and the acceptable false-positive
+    rate; it never reports a false negative.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 1e-6):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        # Distinct items added so far (approximately: false positives are not counted)
+        self.count = 0
+
+    @classmethod
+    def from_bytes(cls, capacity: int, error_rate: float, bits: bytes, count: int = 0) -> 'BloomFilter':
+        """Rebuilds a filter saved from its `bits`; capacity and error rate must match."""
+        bloom = cls(capacity, error_rate)
+        if len(bits) != len(bloom.bits):
+            raise ValueError("bit array does not match the filter size")
+        bloom.bits[:] = bits
+        bloom.count = count
+        return bloom
+
+    def _positions(self, item: str):
+        # Double hashing: k positions derived from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> bool:
+        """Adds an item. Returns True if it was (probably) already present."""
+        present = True
+        for pos in self._positions(item):
+            mask = 1 << (pos & 7)
+            byte = self.bits[pos >> 3]
+            if not byte & mask:
+                present = False
+                self.bits[pos >> 3] = byte | mask
+        if not present:
+            self.count += 1
+        return present
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
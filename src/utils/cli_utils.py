@@ -3,6 +3,7 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 from rich.table import Table
+from rich.progress import Progress, BarColumn, MofNCompleteColumn, TextColumn, TimeElapsedColumn
 from rich import print as rich_print
 
 # Initialize the rich console for all terminal output
@@ -19,11 +20,39 @@ class Colors:
     RED = "red"
     GRAY = "dim white"
     BOLD = "bold"
-    INFO = "info"
-    WARNING = "warning"
+    INFO = "blue"
+    WARNING = "yellow"
     SUCCESS = "green"
     FAILURE = "red"
 
+class ProgressBar:
+    """
+    A minimal progress bar for counting completed scan tasks.
+    Wraps rich's Progress so callers only need `update()` and `close()`.
+    """
+
+    def __init__(self, total: int, desc: str = "Scanning"):
+        self._progress = Progress(
+            TextColumn(f"[{Colors.CYAN}]{{task.description}}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            console=console,
+            transient=True
+        )
+        self._task = self._progress.add_task(desc, total=total)
+        self._progress.start()
+
+    def update(self, advance: int = 1):
+        """Advances the bar, stopping it once every task has completed."""
+        self._progress.update(self._task, advance=advance)
+        if self._progress.finished:
+            self.close()
+
+    def close(self):
+        """Stops rendering the bar. Safe to call more than once."""
+        self._progress.stop()
+
 def setup_logging():
     """Sets up basic logging to console."""
     logging.basicConfig(
@@ -35,12 +64,12 @@ def setup_logging():
 def print_banner():
     """Prints a styled welcome banner for the application."""
     banner_text = Text(
-        """
+        r'''
  dP""b8 Yb  dP 88""Yb 888888 88""Yb 8888P 88 88     88        db    
 dP   `"  YbdP  88__dP 88__   88__dP   dP  88 88     88       dPYb   
 Yb        8P   88""Yb 88""   88"Yb   dP   88 88  .o 88  .o  dP__Yb  
  YboodP  dP    88oodP 888888 88  Yb d8888 88 88ood8 88ood8 dP""""Yb 
-""", style=f"{Colors.BOLD} {Colors.GREEN}"
+''', style=f"{Colors.BOLD} {Colors.GREEN}"
     )
     
     powered_by_text = Text(
@@ -51,6 +80,17 @@ Yb        8P   88""Yb 88""   88"Yb   dP   88 88  .o 88  .o  dP__Yb
     console.print(banner_text)
     console.print(powered_by_text, justify="center")
 
+STATUS_STYLES = {
+    "FOUND": f"[bold {Colors.GREEN}]FOUND[/bold {Colors.GREEN}]",
+    "NOT_FOUND": f"[bold {Colors.RED}]NOT FOUND[/bold {Colors.RED}]",
+    "ERROR": f"[bold {Colors.YELLOW}]ERROR[/bold {Colors.YELLOW}]",
+    "UNAVAILABLE": f"[bold {Colors.GRAY}]UNAVAILABLE[/bold {Colors.GRAY}]"
+}
+
+def format_details(details: dict) -> str:
+    """Renders a result's details as a compact 'key: value' list."""
+    return ", ".join([f"{k}: [i]{v}[/i]" for k, v in details.items() if v is not None])
+
 def print_results(results: list):
     """Prints scan results in a well-formatted table."""
     if not results:
@@ -70,16 +110,37 @@ def print_results(results: list):
             status = site_result.get('status', 'N/A')
             details = site_result.get('details', {})
 
-            status_style = {
-                "FOUND": f"[bold {Colors.GREEN}]FOUND[/bold {Colors.GREEN}]",
-                "NOT_FOUND": f"[bold {Colors.RED}]NOT FOUND[/bold {Colors.RED}]",
-                "ERROR": f"[bold {Colors.YELLOW}]ERROR[/bold {Colors.YELLOW}]",
-                "UNAVAILABLE": f"[bold {Colors.GRAY}]UNAVAILABLE[/bold {Colors.GRAY}]"
-            }.get(status, status)
-
-            details_str = ", ".join([f"{k}: [i]{v}[/i]" for k, v in details.items() if v is not None])
+            status_style = STATUS_STYLES.get(status, status)
+            details_str = format_details(details)
             
             table.add_row(username, site_name, status_style, details_str)
 
     console.print("\n")
     console.print(table)
+
+def print_breaker_summary(summary: dict):
+    """Prints the platforms whose circuit breaker skipped checks during the run."""
+    if not summary:
+        return
+    table = Table(title="[bold]Platforms Skipped by Circuit Breaker[/bold]", box=None, show_header=True)
+    table.add_column("Platform", style="bold", justify="left")
+    table.add_column("State", justify="left")
+    table.add_column("Trips", justify="right")
+    table.add_column("Checks Skipped", justify="right")
+    for platform, state in summary.items():
+        style = Colors.GREEN if state["state"] == "CLOSED" else Colors.YELLOW
+        table.add_row(platform, f"[{style}]{state['state']}[/{style}]", str(state["trips"]), str(state["short_circuited"]))
+    console.print("\n")
+    console.print(table)
+
+def print_result_line(result: dict):
+    """Prints a single streamed (username, site) result as one line."""
+    status = result.get('status', 'N/A')
+    line = (
+        f"[{Colors.CYAN}]{result.get('username', 'N/A')}[/{Colors.CYAN}] "
+        f"[bold]{result.get('site', 'N/A')}[/bold] {STATUS_STYLES.get(status, status)}"
+    )
+    details_str = format_details(result.get('details') or {})
+    if details_str:
+        line += f" [{Colors.GRAY}]{details_str}[/{Colors.GRAY}]"
+    console.print(line)
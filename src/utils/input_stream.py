@@ -0,0 +1,64 @@
+import asyncio
+import sys
+import logging
+from typing import AsyncIterator, Optional
+
+from src.config import ConfigManager
+from .bloom import BloomFilter
+
+# Set up logging for the input pipeline
+logger = logging.getLogger(__name__)
+
+def normalize_username(raw: str) -> str:
+    """Strips whitespace and a leading '@' from a raw input line."""
+    return raw.strip().lstrip("@")
+
+def username_key(raw: str, case_sensitive: bool = False) -> str:
+    """
+    Returns the identity of a username on a platform: two spellings with the same key
+    are the same account. Handles are case-folded unless the platform is case-sensitive.
+    """
+    username = normalize_username(raw)
+    return username if case_sensitive else username.casefold()
+
+class UsernameStream:
+    """
+    Lazily reads usernames from a file, or stdin when the source is '-'.
+    Lines are read in chunks off the event loop, normalized, and de-duplicated
+    with a fixed-size Bloom filter, so memory stays constant for any input size
+    and the scanner can start on the first chunk immediately. Blank lines and
+    lines starting with '#' are skipped.
+    """
+
+    CHUNK_BYTES = 1 << 16
+
+    def __init__(self, source: str, dedupe_capacity: Optional[int] = None, error_rate: Optional[float] = None):
+        config = ConfigManager()
+        self.source = source
+        self.seen = BloomFilter(
+            dedupe_capacity or config.get_setting("scanner.dedupe_capacity", 5000000),
+            error_rate or config.get_setting("scanner.dedupe_error_rate", 1e-6)
+        )
+        self.count = 0
+        self.duplicates = 0
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        stream = sys.stdin if self.source == "-" else open(self.source, "r", encoding="utf-8", errors="replace")
+        try:
+            while True:
+                lines = await asyncio.to_thread(stream.readlines, self.CHUNK_BYTES)
+                if not lines:
+                    break
+                for line in lines:
+                    username = normalize_username(line)
+                    if not username or username.startswith("#"):
+                        continue
+                    if self.seen.add(username.casefold()):
+                        self.duplicates += 1
+                        continue
+                    self.count += 1
+                    yield username
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+            logger.info(f"Read {self.count} unique username(s) from {self.source} ({self.duplicates} duplicate(s) skipped).")
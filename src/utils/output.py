@@ -0,0 +1,34 @@
+import json
+import logging
+from typing import Dict, Any
+
+# Set up logging for result output
+logger = logging.getLogger(__name__)
+
+class NdjsonWriter:
+    """
+    Appends scan results to a file as newline-delimited JSON, one object per line.
+    Each line is flushed as soon as it is written so downstream tools can `tail -f`
+    the file while the scan is still running.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        logger.info(f"Streaming results to {path}")
+
+    def write(self, record: Dict[str, Any]):
+        """Appends a single result."""
+        self._file.write(json.dumps(record, default=str, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        """Closes the output file."""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> 'NdjsonWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
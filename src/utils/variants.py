@@ -0,0 +1,73 @@
+import re
+import itertools
+from typing import Iterator, List, Optional, Sequence
+
+# Characters most platforms accept between the parts of a handle
+SEPARATORS = ("", ".", "_", "-")
+# Suffixes people commonly append when their plain name is taken
+DEFAULT_SUFFIXES = ("1", "01", "7", "11", "12", "13", "21", "22", "23", "69", "77", "88", "99", "123", "1234", "x", "official", "real")
+
+_SPLIT = re.compile(r"[\s._\-]+")
+_HANDLE = re.compile(r"^[a-z0-9._\-]+$")
+
+def _tokens(name: str) -> List[str]:
+    """Splits a name into lower-case parts on whitespace and handle separators."""
+    return [token for token in _SPLIT.split(name.strip().lstrip("@").lower()) if token]
+
+def generate_variants(name: str, suffixes: Sequence[str] = DEFAULT_SUFFIXES, years: Sequence[int] = (),
+                      separators: Sequence[str] = SEPARATORS, max_length: int = 30,
+                      limit: Optional[int] = None) -> Iterator[str]:
+    """
+    Yields plausible handles for a name such as "John Doe": johndoe, john.doe, john_doe,
+    doejohn, jdoe, john.d, johndoe99, john_doe1990 and so on. The plainest forms come
+    first, so a `limit` keeps the likeliest candidates. Variants are unique, at most
+    `max_length` characters long and limited to letters, digits and separators.
+    """
+    tokens = _tokens(name)
+    if not tokens:
+        return
+    seen = set()
+
+    def bases() -> Iterator[str]:
+        if len(tokens) == 1:
+            yield tokens[0]
+            return
+        first, last = tokens[0], tokens[-1]
+        orders = [tokens, [last, first]] if len(tokens) == 2 else [tokens, [first, last], [last, first]]
+        for separator in separators:
+            for parts in orders:
+                yield separator.join(parts)
+        for separator in separators:
+            yield separator.join((first[0], last))
+            yield separator.join((first, last[0]))
+            yield separator.join((last, first[0]))
+        yield first
+        yield last
+
+    def candidates() -> Iterator[str]:
+        plain = list(dict.fromkeys(bases()))
+        yield from plain
+        tails = list(suffixes) + [str(year) for year in years] + [str(year)[-2:] for year in years]
+        for tail in tails:
+            for base in plain:
+                yield base + tail
+                if base[-1:].isalpha() and tail[:1].isalpha():
+                    yield f"{base}_{tail}"
+
+    for candidate in candidates():
+        if candidate in seen or len(candidate) > max_length or not _HANDLE.match(candidate):
+            continue
+        if candidate[0] in "._-" or candidate[-1] in "._-":
+            continue
+        seen.add(candidate)
+        yield candidate
+        if limit is not None and len(seen) >= limit:
+            return
+
+def generate_sweep(names: Sequence[str], limit_per_name: Optional[int] = None, **options) -> Iterator[str]:
+    """Yields the variants of several names, each handle once."""
+    seen = set()
+    for variant in itertools.chain.from_iterable(generate_variants(name, limit=limit_per_name, **options) for name in names):
+        if variant not in seen:
+            seen.add(variant)
+            yield variant
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import multiprocessing
+import queue as queue_module
+from typing import Dict, List, Any, Optional, Awaitable, Callable, Tuple, TYPE_CHECKING
+
+from src.jobs import ScanJob
+
+if TYPE_CHECKING:
+    from src.utils.cli_utils import ProgressBar
+
+# Set up logging for the worker processes
+logger = logging.getLogger(__name__)
+
+# Usernames handed to a worker per message. Larger chunks cut IPC overhead,
+# smaller ones balance the tail of a run better across workers.
+CHUNK_SIZE = 32
+
+# Message kinds sent from workers back to the aggregator
+RESULT, DONE, EXIT = 0, 1, 2
+
+def _worker_main(worker_id: int, workers: int, use_cache: bool, stale_after: Optional[float], concurrency: int,
+                 platforms: List[str], tasks: multiprocessing.Queue, results: multiprocessing.Queue):
+    """Entry point of a worker process: runs its own event loop and HTTP pool."""
+    breakers = None
+    try:
+        breakers = asyncio.run(_worker_loop(worker_id, workers, use_cache, stale_after, concurrency, platforms, tasks, results))
+    except KeyboardInterrupt:
+        # The aggregator receives the same Ctrl+C and handles the shutdown
+        pass
+    finally:
+        results.put((EXIT, worker_id, breakers, None))
+
+async def _worker_loop(worker_id: int, workers: int, use_cache: bool, stale_after: Optional[float], concurrency: int,
+                       platforms: List[str], tasks: multiprocessing.Queue, results: multiprocessing.Queue):
+    """
+    Pulls chunks of (index, username, slots) from the shared task queue and scans them.
+    Results go back as compact (kind, index, slot, result) tuples. Nothing is written to
+    the database here: the aggregator owns the writer, so the cache is only read.
+    Returns the worker's circuit breaker summary for the run summary.
+    """
+    # Imported here so the aggregator can import this module without a cycle
+    from src.core import ProScannerCore, NullProgressBar
+
+    # The aggregator draws the progress bar
+    scanner = ProScannerCore(use_cache=use_cache, platforms=platforms, show_progress=False)
+    scanner.persist = False
+    scanner.stale_after = stale_after
+    await scanner._ensure_ready()
+    scanner.http_client.share_limits(workers)
+    scanner.windows.split(workers)
+    sites = scanner._dispatchable_platforms()
+    no_progress = NullProgressBar()
+    cells = asyncio.Semaphore(concurrency)
+    # Keep enough usernames in flight to fill every request slot
+    usernames_in_flight = asyncio.Semaphore(max(2, 2 * concurrency // max(1, len(sites))))
+    loop = asyncio.get_event_loop()
+    running = set()
+
+    async def scan_cell(index: int, username: str, slot: int):
+        site_name, rules = sites[slot]
+        # Wait on the platform's window before taking one of the worker's slots
+        async with scanner.windows.window(site_name).slot(), cells:
+            result = await scanner._scan_site(username, site_name, rules, no_progress)
+        results.put((RESULT, index, slot, result))
+
+    async def scan_username(index: int, username: str, slots: List[int]):
+        try:
+            start = loop.time()
+            await asyncio.gather(*(scan_cell(index, username, slot) for slot in slots))
+            results.put((DONE, index, username, loop.time() - start))
+        finally:
+            usernames_in_flight.release()
+
+    try:
+        while True:
+            chunk = await asyncio.to_thread(tasks.get)
+            if chunk is None:
+                break
+            for index, username, slots in chunk:
+                await usernames_in_flight.acquire()
+                task = asyncio.create_task(scan_username(index, username, slots))
+                running.add(task)
+                task.add_done_callback(running.discard)
+        if running:
+            await asyncio.gather(*running)
+        return scanner.breaker_summary()
+    finally:
+        await scanner.close()
+
+def _pump(results: multiprocessing.Queue, processes: List[multiprocessing.Process],
+          loop: asyncio.AbstractEventLoop, inbox: asyncio.Queue):
+    """
+    Moves worker messages onto the event loop in batches, from a thread so the loop
+    never blocks on the pipe. Stops once every worker has exited.
+    """
+    exited = 0
+    while exited < len(processes):
+        try:
+            batch = [results.get(timeout=0.5)]
+        except queue_module.Empty:
+            if not any(process.is_alive() for process in processes):
+                # A worker died without saying goodbye; nothing more will arrive
+                break
+            continue
+        try:
+            while len(batch) < 1024:
+                batch.append(results.get_nowait())
+        except queue_module.Empty:
+            pass
+        exited += sum(1 for message in batch if message[0] == EXIT)
+        loop.call_soon_threadsafe(inbox.put_nowait, batch)
+    loop.call_soon_threadsafe(inbox.put_nowait, None)
+
+async def run_sharded_grid(scanner, usernames, workers: int, concurrency: int, progress_bar: "ProgressBar",
+                           on_result: Callable[[int, str, int, Dict], Awaitable[None]],
+                           on_username_done: Optional[Callable[[int, str, float], Awaitable[None]]] = None,
+                           job: Optional[ScanJob] = None):
+    """
+    The multi-process counterpart of ProScannerCore._run_grid, with the same callbacks.
+    This process reads the usernames, deals them out in chunks over a bounded queue to
+    `workers` processes (each with its own event loop, HTTP pool and share of the rate
+    limits), and applies every result: callbacks, cache, sessions, job progress and the
+    progress bar all stay here, so there is still a single database writer.
+    """
+    # Imported here: src.core imports this module lazily
+    from src.core import _aiter_usernames, CHECK_OUTCOMES
+
+    sites = scanner._dispatchable_platforms()
+    context = multiprocessing.get_context("spawn")
+    tasks = context.Queue(maxsize=workers * 4)
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=_worker_main,
+            args=(worker_id, workers, scanner.use_cache, scanner.stale_after, concurrency, list(scanner.platforms), tasks, results),
+            name=f"pro_scanner-worker-{worker_id}",
+            daemon=True
+        )
+        for worker_id in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    logger.info(f"Started {workers} scan worker processes.")
+
+    loop = asyncio.get_event_loop()
+    inbox: asyncio.Queue = asyncio.Queue()
+    pump = loop.run_in_executor(None, _pump, results, processes, loop, inbox)
+    # index -> [username, (platform, result) pairs], for usernames that have not finished yet
+    pending: Dict[int, List] = {}
+
+    async def offer(item):
+        # Never block forever on a full queue whose workers have all died
+        while True:
+            try:
+                return await asyncio.to_thread(tasks.put, item, True, 0.5)
+            except queue_module.Full:
+                if not any(process.is_alive() for process in processes):
+                    raise RuntimeError("All scan workers exited unexpectedly.")
+
+    async def produce():
+        try:
+            chunk: List[Tuple[int, str, List[int]]] = []
+            index = 0
+            async for username in _aiter_usernames(usernames):
+                slots = [slot for slot, (site_name, _) in enumerate(sites) if job is None or not job.is_done(index, site_name)]
+                progress_bar.update(len(sites) - len(slots))
+                if not slots:
+                    # Finished by an earlier run of this job
+                    await job.complete(index)
+                else:
+                    pending[index] = [username, []]
+                    chunk.append((index, username, slots))
+                    if len(chunk) >= CHUNK_SIZE:
+                        await offer(chunk)
+                        chunk = []
+                index += 1
+            if chunk:
+                await offer(chunk)
+        finally:
+            for _ in processes:
+                await offer(None)
+
+    async def consume():
+        while True:
+            batch = await inbox.get()
+            if batch is None:
+                return
+            for kind, index, payload, extra in batch:
+                if kind == RESULT:
+                    slot, result = payload, extra
+                    site_name, rules = sites[slot]
+                    username, done = pending[index]
+                    done.append((site_name, result))
+                    # Checks skipped by an open circuit breaker must not be cached as answers
+                    if not result.get("cached") and result.get("status") != "UNAVAILABLE":
+                        await scanner.remember(site_name, rules, username, result)
+                    progress_bar.update()
+                    # Workers keep their own registries; outcomes are also counted here so the exporter sees them
+                    CHECK_OUTCOMES.labels(site_name, result.get("status")).inc()
+                    await on_result(index, username, slot, result)
+                    if job is not None:
+                        await job.record(index, site_name)
+                elif kind == EXIT:
+                    if payload:
+                        scanner.breakers.absorb(payload)
+                elif kind == DONE:
+                    username, duration = payload, extra
+                    await scanner.db_manager.save_session(username, len(sites), duration, pending.pop(index)[1])
+                    if on_username_done is not None:
+                        await on_username_done(index, username, duration)
+                    if job is not None:
+                        await job.complete(index)
+
+    producer = asyncio.create_task(produce())
+    try:
+        await asyncio.gather(producer, consume())
+        await pump
+        if pending:
+            raise RuntimeError(f"{len(pending)} usernames were lost because a scan worker exited unexpectedly.")
+    finally:
+        producer.cancel()
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join(timeout=5)
+        logger.info("Scan worker processes stopped.")
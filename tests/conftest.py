@@ -0,0 +1,13 @@
+import pytest
+
+from src.db.database_manager import DatabaseManager
+from src.net.http_client import AsyncHttpClient
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    """Gives every test its own database and a fresh shared HTTP client."""
+    monkeypatch.setattr(DatabaseManager, "DB_NAME", str(tmp_path / "pro_scanner.db"))
+    monkeypatch.setattr(AsyncHttpClient, "transport", None)
+    AsyncHttpClient._instance = None
+    yield
+    AsyncHttpClient._instance = None
@@ -0,0 +1,33 @@
+import json
+
+from src import benchmark
+from src.detectors.engine import DeclarativeDetector
+
+def _run(tmp_path, *extra):
+    output = tmp_path / "bench.json"
+    code = benchmark.main(["--usernames", "20", "--latency-ms", "0", "--output", str(output), *extra])
+    return code, json.loads(output.read_text())
+
+def test_benchmark_completes_every_check(tmp_path):
+    code, report = _run(tmp_path)
+    assert code == 0
+    assert report["check_exceptions"] == 0
+    assert report["checks"] == report["expected_checks"] > 0
+    assert report["requests"] > 0
+
+def test_benchmark_fails_when_a_check_raises(tmp_path, monkeypatch):
+    original = DeclarativeDetector.scan
+
+    async def broken(self, username, validators=None):
+        if self.rules.key == "twitter":
+            raise TypeError("broken detector")
+        return await original(self, username, validators)
+
+    monkeypatch.setattr(DeclarativeDetector, "scan", broken)
+    try:
+        code, report = _run(tmp_path)
+    except TypeError:
+        # The scan itself surfaces the error, which also fails the run
+        return
+    assert code == 1
+    assert report["check_exceptions"] > 0
@@ -0,0 +1,56 @@
+import asyncio
+import gc
+import random
+
+import httpx
+import pytest
+
+from src.benchmark import LatencyModel, MockPlatforms
+from src.config import ConfigManager
+from src.core import ProScannerCore
+from src.detectors.engine import compile_platforms
+from src.net.http_client import AsyncHttpClient
+
+@pytest.fixture
+def mock_platforms(monkeypatch):
+    mock = MockPlatforms(compile_platforms(ConfigManager().get_platforms()), LatencyModel("fixed", 0), rng=random.Random(1))
+    monkeypatch.setattr(AsyncHttpClient, "transport", httpx.MockTransport(mock))
+    return mock
+
+def test_grid_fills_every_cell(mock_platforms):
+    async def main():
+        scanner = ProScannerCore(use_cache=False, show_progress=False)
+        try:
+            return await scanner.scan_many([f"user{i}" for i in range(10)], concurrency=4)
+        finally:
+            await scanner.close()
+
+    records = asyncio.run(main())
+    assert [record["username"] for record in records] == [f"user{i}" for i in range(10)]
+    assert all(result is not None for record in records for result in record["results"])
+    assert mock_platforms.counts["requests"] > 0
+
+def test_grid_surfaces_a_failed_check(mock_platforms, monkeypatch):
+    unretrieved = []
+    original = ProScannerCore._scan_site
+
+    async def flaky(self, username, site_name, rules, progress_bar):
+        if username == "user3":
+            raise RuntimeError("check failed")
+        return await original(self, username, site_name, rules, progress_bar)
+
+    monkeypatch.setattr(ProScannerCore, "_scan_site", flaky)
+
+    async def main():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unretrieved.append(context))
+        scanner = ProScannerCore(use_cache=False, show_progress=False)
+        try:
+            await scanner.scan_many([f"user{i}" for i in range(10)], concurrency=4)
+        finally:
+            await scanner.close()
+        gc.collect()
+
+    with pytest.raises(RuntimeError, match="check failed"):
+        asyncio.run(main())
+    gc.collect()
+    assert not [context for context in unretrieved if "never retrieved" in context.get("message", "")]